@@ -0,0 +1,125 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled Chunker Kernels
+
+Cython versions of the hot loops in chunker.py. They are optional:
+chunker.py imports them when the extension has been built and falls back
+to its pure-Python implementations otherwise. Both produce identical
+chunks, so any change here must be mirrored in chunker.py.
+
+Build in place (needs Cython and a C compiler):
+    cythonize -i src/ingestion/_chunker.pyx
+"""
+
+from cpython.unicode cimport Py_UNICODE_ISSPACE
+
+
+cdef inline bint _is_sentence_end(Py_UCS4 ch):
+    return ch == u'.' or ch == u'!' or ch == u'?' or ch == u':'
+
+
+cdef bint _has_nonspace(str text, Py_ssize_t start, Py_ssize_t end):
+    """True if text[start:end] contains a non-whitespace character."""
+    cdef Py_ssize_t i
+    for i in range(start, end):
+        if not Py_UNICODE_ISSPACE(text[i]):
+            return True
+    return False
+
+
+def chunk_text(str text, Py_ssize_t chunk_size, Py_ssize_t overlap):
+    """Compiled chunker.chunk_text()."""
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t start, end, step
+    cdef list chunks = []
+
+    if n == 0:
+        return []
+
+    if n <= chunk_size:
+        return [text]
+
+    step = chunk_size - overlap if overlap < chunk_size else chunk_size
+    if step == 0:
+        raise ValueError("chunk_size - overlap must not be zero")
+    if step < 0:
+        return []
+
+    # Test each window for non-whitespace in place instead of slicing it
+    # first, so whitespace-only windows never allocate
+    start = 0
+    while start < n:
+        end = start + chunk_size
+        if end > n:
+            end = n
+        if _has_nonspace(text, start, end):
+            chunks.append(text[start:end])
+        start += step
+
+    return chunks
+
+
+def split_sentences(str text):
+    """Compiled chunker._split_sentences()."""
+    cdef Py_ssize_t n = len(text)
+    cdef Py_ssize_t i = 0, j, start = 0
+    cdef list sentences = []
+
+    while i < n:
+        if _is_sentence_end(text[i]) and i + 1 < n and Py_UNICODE_ISSPACE(text[i + 1]):
+            # Sentence ends after the run of whitespace following punctuation
+            j = i + 1
+            while j < n and Py_UNICODE_ISSPACE(text[j]):
+                j += 1
+            if _has_nonspace(text, start, j):
+                sentences.append(text[start:j])
+            start = j
+            i = j
+        else:
+            i += 1
+
+    if start < n and _has_nonspace(text, start, n):
+        sentences.append(text[start:n])
+
+    return sentences
+
+
+def pack_sentences(list sentences, Py_ssize_t chunk_size, Py_ssize_t overlap):
+    """Compiled chunker._pack_sentences()."""
+    cdef list chunks = []
+    cdef list parts = []
+    cdef Py_ssize_t cur_len = 0, sent_len
+    cdef bint has_nonspace = False, sentence_has_text
+    cdef str sentence, current_chunk, tail
+
+    for sentence in sentences:
+        sent_len = len(sentence)
+        sentence_has_text = _has_nonspace(sentence, 0, sent_len)
+
+        if cur_len + sent_len > chunk_size:
+            if has_nonspace:
+                current_chunk = "".join(parts)
+                chunks.append(current_chunk.strip())
+
+                if overlap > 0 and cur_len > overlap:
+                    tail = current_chunk[-overlap:]
+                    parts = [tail, sentence]
+                    cur_len = overlap + sent_len
+                    has_nonspace = sentence_has_text or _has_nonspace(tail, 0, len(tail))
+                else:
+                    parts = [sentence]
+                    cur_len = sent_len
+                    has_nonspace = sentence_has_text
+            else:
+                parts = [sentence]
+                cur_len = sent_len
+                has_nonspace = sentence_has_text
+        else:
+            parts.append(sentence)
+            cur_len += sent_len
+            has_nonspace = has_nonspace or sentence_has_text
+
+    if has_nonspace:
+        chunks.append("".join(parts).strip())
+
+    return chunks
@@ -0,0 +1,103 @@
+"""
+Content Cache Module
+
+On-disk cache for results that depend only on an input text
+(embeddings, cleaned text).
+
+Why cache?
+- Re-running ingestion on the same PDFs (common in development) repeats
+  the most expensive work: encoding every chunk with the model
+- Results are keyed by a hash of the text, so unchanged content is a
+  lookup and only new or edited content is recomputed
+
+Storage is a single SQLite file (standard library, no extra dependency).
+"""
+
+import os
+import hashlib
+import sqlite3
+from typing import Dict, Iterable, List, Tuple
+
+# SQLite limits the number of host parameters per statement
+_MAX_PARAMS = 500
+
+
+class ContentCache:
+    """
+    Key/value cache of bytes, stored in a SQLite file.
+
+    Keys are BLAKE2b digests of a namespace plus the input text; the
+    namespace separates results of different models/settings.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path: Path to the SQLite file, e.g. "data/cache/embeddings.sqlite"
+        """
+        cache_dir = os.path.dirname(path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, value BLOB NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(namespace: str, text: str) -> bytes:
+        """
+        Hash a namespace and text into a 16-byte cache key.
+
+        Args:
+            namespace: Identifies what produced the value (e.g. model name)
+            text: Input text
+
+        Returns:
+            Cache key
+        """
+        return hashlib.blake2b(
+            f"{namespace}\0{text}".encode("utf-8"),
+            digest_size=16
+        ).digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, bytes]:
+        """
+        Look up several keys at once.
+
+        Args:
+            keys: Cache keys from make_key()
+
+        Returns:
+            Dictionary of the keys that were found and their values
+        """
+        found = {}
+        for start in range(0, len(keys), _MAX_PARAMS):
+            batch = keys[start:start + _MAX_PARAMS]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT key, value FROM cache WHERE key IN ({placeholders})",
+                batch
+            )
+            found.update(rows)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, bytes]]) -> None:
+        """
+        Store several key/value pairs in one transaction.
+
+        Args:
+            items: (key, value) pairs
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)",
+                items
+            )
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self.conn.close()
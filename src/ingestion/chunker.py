@@ -9,7 +9,162 @@ Why chunking?
 - Overlap between chunks preserves context across boundaries
 """
 
-from typing import List, Dict
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import List, Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+# A sentence is everything up to and including sentence-ending punctuation
+# plus the whitespace after it; the second branch picks up any trailing text
+_SENT_RE = re.compile(r'.*?[.!?:]\s+|.+', re.DOTALL)
+
+# Optional compiled kernels (src/ingestion/_chunker.pyx). Build them with
+# `cythonize -i src/ingestion/_chunker.pyx`; without the extension the
+# pure-Python implementations below are used and produce the same chunks.
+try:
+    from ._chunker import (
+        chunk_text as _chunk_text_c,
+        split_sentences as _split_sentences_c,
+        pack_sentences as _pack_sentences_c,
+    )
+except ImportError:
+    _chunk_text_c = _split_sentences_c = _pack_sentences_c = None
+
+# Optional rule-based sentence boundary detection (chunk_text_smart(splitter="pysbd"))
+try:
+    import pysbd
+except ImportError:
+    pysbd = None
+
+# Sentence splitters supported by chunk_text_smart(splitter=...)
+SPLITTER_OPTIONS = ("simple", "pysbd")
+
+# chunk_pages() only fans out to worker processes above this many pages;
+# below it, process start-up and pickling cost more than the chunking
+PARALLEL_MIN_PAGES = 8
+
+
+def _split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences, keeping punctuation and trailing whitespace.
+
+    One findall pass returns the sentence slices directly, instead of
+    re.split producing text/delimiter pairs that have to be re-joined.
+    A hand-written str.find scan was measured at ~5x slower than this
+    in CPython, so the scan stays inside the regex engine.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of sentences (whitespace-only pieces removed)
+    """
+    return [s for s in _SENT_RE.findall(text) if s.strip()]
+
+
+@lru_cache(maxsize=1)
+def _get_segmenter():
+    """Build the pysbd segmenter once (it compiles its rule set on creation)."""
+    if pysbd is None:
+        raise ImportError("splitter='pysbd' requires the pysbd package (pip install pysbd)")
+    return pysbd.Segmenter(language="en", clean=False, char_span=True)
+
+
+def _split_sentences_pysbd(text: str) -> List[str]:
+    """
+    Split text into sentences with pysbd's rule-based boundary detection.
+
+    Unlike the simple splitter, this does not break on abbreviations
+    ("Dr. Smith", "e.g."), decimals ("$10.00") or list colons, so it
+    produces fewer tiny fragments.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of sentences with their trailing whitespace, like _split_sentences()
+    """
+    # Slice between span starts so no characters are lost between sentences
+    starts = [span.start for span in _get_segmenter().segment(text)]
+    if not starts:
+        return []
+    starts[0] = 0
+
+    bounds = zip(starts, starts[1:] + [len(text)])
+    return [s for s in (text[a:b] for a, b in bounds) if s.strip()]
+
+
+def _pack_sentences(
+    sentences: List[str],
+    chunk_size: int,
+    overlap: int
+) -> List[str]:
+    """
+    Greedily pack sentences into chunks of at most chunk_size characters.
+
+    Sentences are never split, so a sentence longer than chunk_size
+    produces an oversized chunk. Each new chunk starts with the last
+    `overlap` characters of the previous one.
+
+    Args:
+        sentences: Sentences from _split_sentences()
+        chunk_size: Target size of each chunk in characters
+        overlap: Number of characters to overlap between chunks
+
+    Returns:
+        List of text chunks
+    """
+    # Collect sentence fragments and join only when a chunk is flushed;
+    # growing a string with += copies the whole chunk on every sentence.
+    # has_nonspace tracks whether the fragments hold any text, so the
+    # chunk doesn't have to be stripped just to test for emptiness.
+    chunks = []
+    parts: List[str] = []
+    cur_len = 0
+    has_nonspace = False
+
+    for sentence in sentences:
+        sentence_has_text = bool(sentence) and not sentence.isspace()
+
+        # If adding this sentence would exceed chunk size
+        if cur_len + len(sentence) > chunk_size:
+            # Save current chunk if it's not empty
+            if has_nonspace:
+                current_chunk = "".join(parts)
+                chunks.append(current_chunk.strip())
+
+                # Start new chunk with overlap from previous
+                if overlap > 0 and cur_len > overlap:
+                    tail = current_chunk[-overlap:]
+                    parts = [tail, sentence]
+                    cur_len = overlap + len(sentence)
+                    has_nonspace = sentence_has_text or not tail.isspace()
+                else:
+                    parts = [sentence]
+                    cur_len = len(sentence)
+                    has_nonspace = sentence_has_text
+            else:
+                # Current chunk is empty, so just use this sentence
+                # Even if it's longer than chunk_size
+                parts = [sentence]
+                cur_len = len(sentence)
+                has_nonspace = sentence_has_text
+        else:
+            # Add sentence to current chunk
+            parts.append(sentence)
+            cur_len += len(sentence)
+            has_nonspace = has_nonspace or sentence_has_text
+
+    # Don't forget the last chunk
+    if has_nonspace:
+        chunks.append("".join(parts).strip())
+
+    return chunks
 
 
 def chunk_text(
@@ -37,6 +192,9 @@ def chunk_text(
         >>> chunks[1][:50]   # First 50 chars of chunk 1
         # These should be identical (the overlap)
     """
+    if _chunk_text_c is not None:
+        return _chunk_text_c(text, chunk_size, overlap)
+
     if not text or len(text) == 0:
         return []
 
@@ -44,34 +202,24 @@ def chunk_text(
     if len(text) <= chunk_size:
         return [text]
 
-    chunks = []
-    start = 0
-
-    while start < len(text):
-        # Calculate end position
-        end = start + chunk_size
-
-        # Get the chunk
-        chunk = text[start:end]
+    # The stride is fixed, so all start positions are known up front
+    # (overlap >= chunk_size would never advance, so step by chunk_size)
+    step = chunk_size - overlap if overlap < chunk_size else chunk_size
 
-        # Only add non-empty chunks
-        if chunk.strip():
-            chunks.append(chunk)
-
-        # Move start position (accounting for overlap)
-        start = end - overlap
-
-        # Prevent infinite loop if overlap >= chunk_size
-        if overlap >= chunk_size:
-            start = end
-
-    return chunks
+    # Only keep chunks that aren't pure whitespace (isspace() avoids
+    # allocating a stripped copy of every chunk)
+    return [
+        chunk
+        for start in range(0, len(text), step)
+        if not (chunk := text[start:start + chunk_size]).isspace()
+    ]
 
 
 def chunk_text_smart(
     text: str,
     chunk_size: int = 500,
-    overlap: int = 50
+    overlap: int = 50,
+    splitter: str = "simple"
 ) -> List[str]:
     """
     Split text into chunks, trying to break at sentence boundaries.
@@ -85,6 +233,10 @@ def chunk_text_smart(
         text: Input text to chunk
         chunk_size: Target size of each chunk in characters
         overlap: Number of characters to overlap between chunks
+        splitter: How to find sentence boundaries
+            - "simple": Any of . ! ? : followed by whitespace (default)
+            - "pysbd": Rule-based detection that handles abbreviations
+              and decimals (needs the optional pysbd package)
 
     Returns:
         List of text chunks with smart boundaries
@@ -100,60 +252,47 @@ def chunk_text_smart(
     if len(text) <= chunk_size:
         return [text]
 
-    # Split into sentences first
-    import re
-    # Split on sentence-ending punctuation followed by space
-    sentences = re.split(r'([.!?:]\s+)', text)
-
-    # Rejoin sentences with their punctuation
-    sentences = [''.join(sentences[i:i+2]) for i in range(0, len(sentences), 2)]
-    sentences = [s for s in sentences if s.strip()]
-
-    chunks = []
-    current_chunk = ""
-
-    for sentence in sentences:
-        # If adding this sentence would exceed chunk size
-        if len(current_chunk) + len(sentence) > chunk_size:
-            # Save current chunk if it's not empty
-            if current_chunk.strip():
-                chunks.append(current_chunk.strip())
+    if splitter not in SPLITTER_OPTIONS:
+        raise ValueError(f"Unknown splitter: {splitter}. Use one of {SPLITTER_OPTIONS}")
 
-                # Start new chunk with overlap from previous
-                if overlap > 0 and len(current_chunk) > overlap:
-                    current_chunk = current_chunk[-overlap:] + sentence
-                else:
-                    current_chunk = sentence
-            else:
-                # Current chunk is empty, so just use this sentence
-                # Even if it's longer than chunk_size
-                current_chunk = sentence
-        else:
-            # Add sentence to current chunk
-            current_chunk += sentence
-
-    # Don't forget the last chunk
-    if current_chunk.strip():
-        chunks.append(current_chunk.strip())
+    # Split into sentences first
+    if splitter == "pysbd":
+        sentences = _split_sentences_pysbd(text)
+    elif _split_sentences_c is not None:
+        sentences = _split_sentences_c(text)
+    else:
+        sentences = _split_sentences(text)
 
-    return chunks
+    # Then pack them into chunks
+    if _pack_sentences_c is not None:
+        return _pack_sentences_c(sentences, chunk_size, overlap)
+    return _pack_sentences(sentences, chunk_size, overlap)
 
 
 def chunk_pages(
     pages: List[Dict],
     chunk_size: int = 500,
     overlap: int = 50,
-    smart: bool = True
+    smart: bool = True,
+    splitter: str = "simple",
+    workers: Optional[int] = 1
 ) -> List[Dict]:
     """
     Chunk text from multiple pages (from PDF parser output).
 
+    Pages are independent, so with workers > 1 (or None) and more than
+    PARALLEL_MIN_PAGES pages they are chunked in a process pool. Chunk
+    order and metadata are the same as with sequential chunking.
+
     Args:
         pages: List of page dictionaries from text_cleaner.clean_pages()
                Format: [{"page_num": 1, "text": "...", "source": "file.pdf"}, ...]
         chunk_size: Target chunk size in characters
         overlap: Overlap between chunks
         smart: Use smart chunking (sentence boundaries) vs simple chunking
+        splitter: Sentence splitter for smart chunking ("simple" or "pysbd")
+        workers: Number of worker processes (default: 1, chunk in this
+                 process; None for os.cpu_count())
 
     Returns:
         List of chunk dictionaries with metadata:
@@ -171,8 +310,69 @@ def chunk_pages(
         >>> pages = clean_pages(parse_pdf("doc.pdf"))
         >>> chunks = chunk_pages(pages, chunk_size=500, overlap=50)
     """
-    all_chunks = []
-    chunk_func = chunk_text_smart if smart else chunk_text
+    workers = workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(pages) <= PARALLEL_MIN_PAGES:
+        return list(iter_chunks(pages, chunk_size, overlap, smart, splitter))
+
+    chunk_func = partial(chunk_text_smart, splitter=splitter) if smart else chunk_text
+    pages = [page for page in pages if page.get('text', '').strip()]
+    texts = [page['text'] for page in pages]
+
+    # Several pages per task amortizes the cost of pickling to the workers
+    batch = max(1, len(texts) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            chunk_func,
+            texts,
+            [chunk_size] * len(texts),
+            [overlap] * len(texts),
+            chunksize=batch
+        )
+
+        chunks = []
+        for page, page_chunks in zip(pages, results):
+            chunks.extend(_page_chunk_dicts(page, page_chunks))
+
+    return chunks
+
+
+def _page_chunk_dicts(page: Dict, page_chunks: List[str]) -> Iterator[Dict]:
+    """Attach a page's metadata to each of its chunk texts."""
+    for i, chunk_text in enumerate(page_chunks):
+        yield {
+            "text": chunk_text,
+            "source": page.get('source', 'unknown'),
+            "page_num": page.get('page_num', 0),
+            "chunk_index": i
+        }
+
+
+def iter_chunks(
+    pages: Iterable[Dict],
+    chunk_size: int = 500,
+    overlap: int = 50,
+    smart: bool = True,
+    splitter: str = "simple"
+) -> Iterator[Dict]:
+    """
+    Lazily chunk pages, yielding one chunk dictionary at a time.
+
+    Same chunks as chunk_pages(), but nothing is materialized: pages can
+    come from a generator and chunks can be consumed as they are produced
+    (e.g. by Embedder.embed_stream()).
+
+    Args:
+        pages: Iterable of page dictionaries
+        chunk_size: Target chunk size in characters
+        overlap: Overlap between chunks
+        smart: Use smart chunking (sentence boundaries) vs simple chunking
+        splitter: Sentence splitter for smart chunking ("simple" or "pysbd")
+
+    Yields:
+        Chunk dictionaries with "text", "source", "page_num", "chunk_index"
+    """
+    chunk_func = partial(chunk_text_smart, splitter=splitter) if smart else chunk_text
 
     for page in pages:
         page_text = page.get('text', '')
@@ -180,20 +380,124 @@ def chunk_pages(
         if not page_text.strip():
             continue
 
-        # Chunk the page text
+        # Chunk the page text and add metadata to each chunk
         page_chunks = chunk_func(page_text, chunk_size, overlap)
+        yield from _page_chunk_dicts(page, page_chunks)
 
-        # Add metadata to each chunk
-        for i, chunk_text in enumerate(page_chunks):
-            chunk_dict = {
-                "text": chunk_text,
-                "source": page.get('source', 'unknown'),
-                "page_num": page.get('page_num', 0),
-                "chunk_index": i
+
+@dataclass
+class ChunkBatch:
+    """
+    Columnar (struct-of-arrays) form of chunk_pages() output.
+
+    Instead of one dict per chunk, each field is one column. Source
+    filenames are stored once in source_lookup and referenced by integer
+    id, so the per-chunk metadata is three packed int32 values.
+
+    Attributes:
+        texts: Chunk texts (pass straight to Embedder.embed_texts())
+        source_ids: int32 array, index into source_lookup per chunk
+        page_nums: int32 array, page number per chunk
+        chunk_indices: int32 array, chunk index within its page
+        source_lookup: Unique source filenames
+        embeddings: (num_chunks, dimension) matrix, set by
+            Embedder.embed_batch()
+    """
+    texts: List[str]
+    source_ids: np.ndarray
+    page_nums: np.ndarray
+    chunk_indices: np.ndarray
+    source_lookup: List[str]
+    embeddings: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def source(self, i: int) -> str:
+        """Source filename of chunk i."""
+        return self.source_lookup[self.source_ids[i]]
+
+    def to_dicts(self) -> List[Dict]:
+        """
+        Convert back to the list-of-dicts format returned by chunk_pages().
+
+        Needed by per-chunk consumers such as metadata_tagger.tag_chunks().
+        """
+        return [
+            {
+                "text": text,
+                "source": self.source_lookup[source_id],
+                "page_num": page_num,
+                "chunk_index": chunk_index
             }
-            all_chunks.append(chunk_dict)
+            for text, source_id, page_num, chunk_index in zip(
+                self.texts,
+                self.source_ids.tolist(),
+                self.page_nums.tolist(),
+                self.chunk_indices.tolist()
+            )
+        ]
+
+
+def chunk_pages_batch(
+    pages: List[Dict],
+    chunk_size: int = 500,
+    overlap: int = 50,
+    smart: bool = True,
+    splitter: str = "simple"
+) -> ChunkBatch:
+    """
+    Chunk text from multiple pages into a columnar ChunkBatch.
+
+    Same chunks as chunk_pages(), without building a dict per chunk.
+
+    Args:
+        pages: List of page dictionaries from text_cleaner.clean_pages()
+        chunk_size: Target chunk size in characters
+        overlap: Overlap between chunks
+        smart: Use smart chunking (sentence boundaries) vs simple chunking
+        splitter: Sentence splitter for smart chunking ("simple" or "pysbd")
+
+    Returns:
+        ChunkBatch with one entry per chunk
+
+    Example:
+        >>> batch = chunk_pages_batch(clean_pages(parse_pdf("doc.pdf")))
+        >>> embeddings = embedder.embed_texts(batch.texts)
+    """
+    chunk_func = partial(chunk_text_smart, splitter=splitter) if smart else chunk_text
+
+    texts: List[str] = []
+    source_ids = array('i')
+    page_nums = array('i')
+    chunk_indices = array('i')
+    source_to_id: Dict[str, int] = {}
+
+    for page in pages:
+        page_text = page.get('text', '')
+
+        if not page_text.strip():
+            continue
+
+        page_chunks = chunk_func(page_text, chunk_size, overlap)
+        n = len(page_chunks)
+
+        # Intern the source filename
+        source = page.get('source', 'unknown')
+        source_id = source_to_id.setdefault(source, len(source_to_id))
+
+        texts.extend(page_chunks)
+        source_ids.extend([source_id] * n)
+        page_nums.extend([page.get('page_num', 0)] * n)
+        chunk_indices.extend(range(n))
 
-    return all_chunks
+    return ChunkBatch(
+        texts=texts,
+        source_ids=np.frombuffer(source_ids, dtype=np.int32),
+        page_nums=np.frombuffer(page_nums, dtype=np.int32),
+        chunk_indices=np.frombuffer(chunk_indices, dtype=np.int32),
+        source_lookup=list(source_to_id)
+    )
 
 
 def get_chunk_stats(chunks: List[Dict]) -> Dict:
@@ -224,14 +528,20 @@ def get_chunk_stats(chunks: List[Dict]) -> Dict:
             "total_chars": 0
         }
 
-    chunk_sizes = [len(chunk['text']) for chunk in chunks]
+    # One pass to collect sizes; the reductions then run in numpy
+    chunk_sizes = np.fromiter(
+        (len(chunk['text']) for chunk in chunks),
+        dtype=np.int64,
+        count=len(chunks)
+    )
+    total_chars = int(chunk_sizes.sum())
 
     return {
         "total_chunks": len(chunks),
-        "avg_chunk_size": sum(chunk_sizes) // len(chunk_sizes),
-        "min_chunk_size": min(chunk_sizes),
-        "max_chunk_size": max(chunk_sizes),
-        "total_chars": sum(chunk_sizes)
+        "avg_chunk_size": total_chars // len(chunks),
+        "min_chunk_size": int(chunk_sizes.min()),
+        "max_chunk_size": int(chunk_sizes.max()),
+        "total_chars": total_chars
     }
 
 
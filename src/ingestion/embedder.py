@@ -3,15 +3,67 @@ Embedding Generator Module
 
 Converts text chunks into numerical vectors (embeddings) for semantic search.
 
-Uses sentence-transformers library with all-MiniLM-L6-v2 model:
+Uses sentence-transformers library with all-MiniLM-L6-v2 model
+(ONNX Runtime and fastembed backends are optional alternatives):
 - 384-dimensional vectors
 - Fast inference (~50ms per text)
 - Good quality for semantic similarity
 """
 
+import os
 import numpy as np
-from typing import List, Dict
-from sentence_transformers import SentenceTransformer
+from dataclasses import dataclass
+from itertools import islice
+from typing import List, Dict, Iterable, Optional, Tuple
+
+try:
+    from .cache import ContentCache
+except ImportError:  # Run as a script: python src/ingestion/embedder.py
+    from cache import ContentCache
+
+# Output precisions supported by Embedder(quantize=...)
+QUANTIZE_OPTIONS = ("fp32", "fp16", "int8")
+
+# Inference backends supported by Embedder(backend=...)
+BACKEND_OPTIONS = ("torch", "onnx", "fastembed")
+
+# Backends that only run on CPU (device is ignored)
+CPU_ONLY_BACKENDS = ("onnx", "fastembed")
+
+# Where exported + quantized ONNX models are cached between runs
+DEFAULT_ONNX_DIR = os.path.join("~", ".cache", "health-enrollment-assistant", "onnx")
+
+# Default batch sizes; a GPU batch needs to be much larger to keep it busy
+CPU_BATCH_SIZE = 32
+GPU_BATCH_SIZE = 256
+
+# embed_stream() encodes this many batches per window, so the length sort
+# in embed_texts() still has texts to group
+STREAM_WINDOW_BATCHES = 8
+
+# Token limit used by the ONNX backend (matches all-MiniLM-L6-v2's
+# sentence-transformers max_seq_length)
+ONNX_MAX_SEQ_LENGTH = 256
+
+
+@dataclass
+class ChunkStore:
+    """
+    Chunks with their embeddings held as one matrix (struct-of-arrays).
+
+    Row i of embeddings belongs to meta[i]. The chunk dicts never carry
+    their own vector, so the index build can hand the matrix to FAISS
+    without gathering per-chunk arrays.
+
+    Attributes:
+        embeddings: (num_chunks, dimension) matrix from Embedder.embed_texts()
+        meta: Chunk dictionaries (text, source, state, ...), in row order
+    """
+    embeddings: np.ndarray
+    meta: List[Dict]
+
+    def __len__(self) -> int:
+        return len(self.meta)
 
 
 class Embedder:
@@ -21,12 +73,46 @@ class Embedder:
     The model is loaded once and reused for all embeddings.
     """
 
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        quantize: str = "fp32",
+        backend: str = "torch",
+        onnx_dir: Optional[str] = None,
+        device: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        normalize: bool = True
+    ):
         """
         Initialize the embedder with a specific model.
 
         Args:
             model_name: HuggingFace model name (default: all-MiniLM-L6-v2)
+            quantize: Output precision of returned embeddings
+                - "fp32": Model output as-is (default)
+                - "fp16": Half precision, 2x smaller
+                - "int8": L2-normalized and scaled to [-127, 127], 4x smaller.
+                  Cosine/dot-product ranking is preserved; compare int8
+                  vectors only with other int8 vectors from this embedder.
+            backend: Inference engine
+                - "torch": sentence-transformers / PyTorch (default)
+                - "onnx": ONNX Runtime with INT8 dynamically quantized
+                  weights (CPU only, needs `optimum[onnxruntime]`).
+                  Mean-pooled and L2-normalized like all-MiniLM-L6-v2.
+                - "fastembed": Qdrant fastembed's prebuilt ONNX models
+                  (CPU only, needs `fastembed`, no PyTorch). model_name
+                  must be a model fastembed supports; all-MiniLM-L6-v2 is.
+            onnx_dir: Cache directory for the exported ONNX model
+                (default: ~/.cache/health-enrollment-assistant/onnx)
+            device: "cpu", "cuda" or None/"auto" to use CUDA when available.
+                On CUDA the model runs in fp16. Ignored by the onnx and
+                fastembed backends (always CPU).
+            cache_dir: Directory for an on-disk embedding cache keyed by a
+                hash of model + text. Texts seen in earlier runs are not
+                re-encoded. None disables caching (default).
+            normalize: Return unit-length (L2-normalized) vectors, so cosine
+                similarity is a plain dot product (default: True). The onnx
+                backend always normalizes.
 
         Model Details:
             - Size: ~80MB
@@ -34,11 +120,219 @@ class Embedder:
             - Output: 384 dimensions
             - Quality: Good for general semantic similarity
         """
-        print(f"Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
-        self.dimension = self.model.get_sentence_embedding_dimension()
+        if quantize not in QUANTIZE_OPTIONS:
+            raise ValueError(f"Unknown quantize: {quantize}. Use one of {QUANTIZE_OPTIONS}")
+        self.quantize = quantize
+
+        if backend not in BACKEND_OPTIONS:
+            raise ValueError(f"Unknown backend: {backend}. Use one of {BACKEND_OPTIONS}")
+        self.backend = backend
+
+        self.model_name = model_name
+        self.normalize = normalize
+        self.device = "cpu" if backend in CPU_ONLY_BACKENDS else _resolve_device(device)
+        # Precision the model computes in (fp16 weights on CUDA, see below);
+        # output is always returned as float32
+        self.compute_dtype = "fp16" if backend == "torch" and self.device == "cuda" else "fp32"
+        self.default_batch_size = GPU_BATCH_SIZE if self.device == "cuda" else CPU_BATCH_SIZE
+
+        print(f"Loading embedding model: {model_name} (backend: {backend}, device: {self.device})")
+        if backend == "onnx":
+            self._load_onnx(model_name, onnx_dir or DEFAULT_ONNX_DIR)
+            self.max_seq_length = ONNX_MAX_SEQ_LENGTH
+            # Probe the output size once instead of reading model config
+            self.dimension = self._encode(["dimension probe"]).shape[1]
+        elif backend == "fastembed":
+            from fastembed import TextEmbedding
+            self.model = TextEmbedding(model_name=model_name)
+            # fastembed tokenizes internally, so chunks can't be pre-tokenized
+            self.tokenizer = None
+            self.dimension = self._encode(["dimension probe"]).shape[1]
+        else:
+            # Imported here so the ONNX/fastembed backends don't load PyTorch
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(model_name, device=self.device)
+            if self.device == "cuda":
+                # fp16 halves memory traffic and uses tensor cores
+                self.model.half()
+            self.tokenizer = self.model.tokenizer
+            self.max_seq_length = self.model.max_seq_length
+            self.dimension = self.model.get_sentence_embedding_dimension()
         print(f"Model loaded. Embedding dimension: {self.dimension}")
 
+        self._cache = None
+        if cache_dir is not None:
+            self._cache = ContentCache(os.path.join(cache_dir, "embeddings.sqlite"))
+            # Unquantized vectors are cached, so quantize isn't part of the
+            # key; the compute precision is, since fp16 and fp32 model runs
+            # give slightly different vectors
+            self._cache_namespace = (
+                f"{model_name}|{backend}|{self.compute_dtype}|{'unit' if normalize else 'raw'}"
+            )
+            print(f"Embedding cache: {self._cache.path}")
+
+    def _load_onnx(self, model_name: str, onnx_dir: str) -> None:
+        """
+        Export the model to ONNX, quantize its weights to INT8 and open a session.
+
+        The export and quantization run once; later runs load the cached
+        quantized model from onnx_dir.
+
+        Args:
+            model_name: HuggingFace model name
+            onnx_dir: Cache directory for exported models
+        """
+        import onnxruntime as ort
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        export_dir = os.path.join(os.path.expanduser(onnx_dir), model_name.replace('/', '__'))
+        quantized_path = os.path.join(export_dir, "model_quantized.onnx")
+
+        if not os.path.exists(quantized_path):
+            print(f"Exporting {model_name} to ONNX: {export_dir}")
+            ort_model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            ort_model.save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(export_dir)
+
+            quantize_dynamic(
+                os.path.join(export_dir, "model.onnx"),
+                quantized_path,
+                weight_type=QuantType.QInt8
+            )
+
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self.session = ort.InferenceSession(quantized_path, providers=["CPUExecutionProvider"])
+        self._onnx_inputs = {i.name for i in self.session.get_inputs()}
+
+    def _encode_onnx(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        input_ids: Optional[List[List[int]]] = None
+    ) -> np.ndarray:
+        """
+        Run the ONNX session over texts in batches.
+
+        Args:
+            texts: List of text strings
+            batch_size: Number of texts per session run
+            input_ids: Token ids of texts from tokenize_chunks(); when
+                given, batches are only padded instead of re-tokenized
+
+        Returns:
+            float32 array of shape (num_texts, dimension), L2-normalized
+        """
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            if input_ids is not None:
+                encoded = self.tokenizer.pad(
+                    {"input_ids": input_ids[start:start + batch_size]},
+                    return_tensors="np"
+                )
+                if "token_type_ids" in self._onnx_inputs and "token_type_ids" not in encoded:
+                    encoded["token_type_ids"] = np.zeros_like(encoded["input_ids"])
+            else:
+                encoded = self.tokenizer(
+                    texts[start:start + batch_size],
+                    padding=True,
+                    truncation=True,
+                    max_length=ONNX_MAX_SEQ_LENGTH,
+                    return_tensors="np"
+                )
+            inputs = {k: v for k, v in encoded.items() if k in self._onnx_inputs}
+            token_embeddings = self.session.run(None, inputs)[0]
+
+            # Mean pooling over real (non-padding) tokens
+            mask = encoded["attention_mask"].astype(np.float32)
+            summed = np.einsum("bth,bt->bh", token_embeddings, mask)
+            counts = np.maximum(mask.sum(axis=1, keepdims=True), 1e-9)
+            batches.append(summed / counts)
+
+        embeddings = np.concatenate(batches).astype(np.float32, copy=False)
+        return _l2_normalize(embeddings)
+
+    def _encode_token_ids(self, input_ids: List[List[int]], batch_size: int = 32) -> np.ndarray:
+        """
+        Run the sentence-transformers model on already tokenized texts.
+
+        Same output as SentenceTransformer.encode(), minus its tokenization
+        step: each batch is only padded, then passed through the model's
+        modules (transformer, pooling, ...).
+
+        Args:
+            input_ids: Token ids per text, unpadded
+            batch_size: Number of texts per forward pass
+
+        Returns:
+            float32 array of shape (num_texts, dimension)
+        """
+        import torch
+
+        batches = []
+        for start in range(0, len(input_ids), batch_size):
+            features = self.tokenizer.pad(
+                {"input_ids": input_ids[start:start + batch_size]},
+                return_tensors="pt"
+            )
+            features = {k: v.to(self.device) for k, v in features.items()}
+
+            with torch.no_grad():
+                embeddings = self.model(features)["sentence_embedding"]
+                if self.normalize:
+                    embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
+            batches.append(embeddings.float().cpu().numpy())
+
+        return np.concatenate(batches)
+
+    def _encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress: bool = False,
+        input_ids: Optional[List[List[int]]] = None
+    ) -> np.ndarray:
+        """
+        Encode texts to float32 embeddings with the configured backend.
+
+        Args:
+            texts: List of text strings
+            batch_size: Number of texts to process at once
+            show_progress: Show progress bar (torch backend only)
+            input_ids: Token ids of texts from tokenize_chunks(), used
+                instead of tokenizing again (ignored by fastembed)
+
+        Returns:
+            float32 array of shape (num_texts, dimension), unit length
+            when self.normalize is set
+        """
+        if self.backend == "onnx":
+            return self._encode_onnx(texts, batch_size, input_ids)
+
+        if self.backend == "fastembed":
+            # embed() yields one vector per text
+            embeddings = np.asarray(list(self.model.embed(texts, batch_size=batch_size)), dtype=np.float32)
+            return _l2_normalize(embeddings) if self.normalize else embeddings
+
+        if input_ids is not None:
+            return self._encode_token_ids(input_ids, batch_size)
+
+        # sentence-transformers normalizes in the same pass as pooling. A
+        # halved model (CUDA) returns float16, so widen to float32 like
+        # _encode_token_ids() does (no copy when already float32)
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            show_progress_bar=show_progress,
+            convert_to_numpy=True,
+            normalize_embeddings=self.normalize
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+
     def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
@@ -56,17 +350,26 @@ class Embedder:
             (384,)
         """
         # Generate embedding
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding
-
-    def embed_texts(self, texts: List[str], batch_size: int = 32, show_progress: bool = True) -> np.ndarray:
+        embedding = self._encode([text])[0]
+        return self._quantize(embedding)
+
+    def embed_texts(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        show_progress: bool = True,
+        input_ids: Optional[List[List[int]]] = None
+    ) -> np.ndarray:
         """
         Generate embeddings for multiple texts (batched for efficiency).
 
         Args:
             texts: List of text strings
-            batch_size: Number of texts to process at once (default: 32)
+            batch_size: Number of texts to process at once
+                (default: 32 on CPU, 256 on GPU)
             show_progress: Show progress bar (default: True)
+            input_ids: Optional token ids for each text (see
+                tokenize_chunks()), so the texts aren't tokenized again
 
         Returns:
             numpy array of shape (num_texts, 384) - matrix of embeddings
@@ -77,26 +380,179 @@ class Embedder:
             >>> embeddings.shape
             (3, 384)
         """
-        # Generate embeddings in batches
-        embeddings = self.model.encode(
-            texts,
+        if batch_size is None:
+            batch_size = self.default_batch_size
+
+        if not texts:
+            return self._quantize(np.zeros((0, self.dimension), dtype=np.float32))
+
+        if self._cache is not None:
+            embeddings = self._encode_cached(texts, batch_size, show_progress, input_ids)
+        else:
+            embeddings = self._encode_sorted(texts, batch_size, show_progress, input_ids)
+        return self._quantize(embeddings)
+
+    def _encode_sorted(
+        self,
+        texts: List[str],
+        batch_size: int,
+        show_progress: bool,
+        input_ids: Optional[List[List[int]]] = None
+    ) -> np.ndarray:
+        """
+        Encode texts in length order and return rows in the input order.
+
+        Sorting by length means each batch holds similar-length texts and
+        pads few tokens.
+        """
+        if input_ids is not None:
+            order = np.argsort([len(ids) for ids in input_ids], kind="stable")
+            input_ids = [input_ids[i] for i in order]
+        else:
+            order = np.argsort([len(text) for text in texts], kind="stable")
+
+        sorted_embeddings = self._encode(
+            [texts[i] for i in order],
             batch_size=batch_size,
-            show_progress_bar=show_progress,
-            convert_to_numpy=True
+            show_progress=show_progress,
+            input_ids=input_ids
         )
+
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+        return embeddings
+
+    def _encode_cached(
+        self,
+        texts: List[str],
+        batch_size: int,
+        show_progress: bool,
+        input_ids: Optional[List[List[int]]] = None
+    ) -> np.ndarray:
+        """
+        Encode only texts missing from the cache, then store their vectors.
+
+        Returns:
+            float32 array of shape (num_texts, dimension) in input order
+        """
+        keys = [ContentCache.make_key(self._cache_namespace, text) for text in texts]
+        hits = self._cache.get_many(list(set(keys)))
+
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        misses = []
+        for i, key in enumerate(keys):
+            if key in hits:
+                embeddings[i] = np.frombuffer(hits[key], dtype=np.float32)
+            else:
+                misses.append(i)
+
+        if show_progress:
+            print(f"Embedding cache: {len(texts) - len(misses)} hits, {len(misses)} to encode")
+
+        if misses:
+            computed = self._encode_sorted(
+                [texts[i] for i in misses],
+                batch_size,
+                show_progress,
+                None if input_ids is None else [input_ids[i] for i in misses]
+            )
+            embeddings[misses] = computed
+            self._cache.put_many(
+                (keys[i], row.tobytes()) for i, row in zip(misses, embeddings[misses])
+            )
+
         return embeddings
 
-    def embed_chunks(self, chunks: List[Dict], batch_size: int = 32, show_progress: bool = True) -> List[Dict]:
+    def _quantize(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Convert fp32 model output to the configured precision.
+
+        Args:
+            embeddings: Embedding vector or matrix (float32)
+
+        Returns:
+            Embeddings as float32, float16 or int8
+        """
+        if self.quantize == "fp16":
+            return embeddings.astype(np.float16)
+
+        if self.quantize == "int8":
+            # Unit vectors have every component in [-1, 1], so a fixed
+            # scale of 127 maps them onto int8 without per-row scales
+            unit = embeddings if self.normalize else _l2_normalize(embeddings)
+            return np.round(unit * 127).astype(np.int8)
+
+        return embeddings
+
+    def tokenize_chunks(self, chunks: List[Dict]) -> List[Dict]:
+        """
+        Tokenize chunk texts once and store the token ids on the chunks.
+
+        Adds 'input_ids' and 'attention_mask' (unpadded lists) to each
+        chunk, plus 'input_ids_text_hash', a hash of the text they were
+        made from. embed_chunks() and later stages using the same
+        tokenizer (e.g. a reranker) can then reuse them instead of
+        tokenizing the same text again. Chunks whose ids are missing, or
+        whose text has changed since, are (re-)tokenized. Chunks are
+        updated in place. Does nothing for the fastembed backend.
+
+        Args:
+            chunks: List of chunk dictionaries with a 'text' field
+
+        Returns:
+            The input chunks
+
+        Example:
+            >>> chunks = embedder.tokenize_chunks(chunks)
+            >>> chunks[0]['input_ids'][:3]
+            [101, 2054, 2024]
+        """
+        if self.tokenizer is None:
+            return chunks
+
+        # hash() of a str is computed once and cached on the string; it
+        # differs between processes, which only means re-tokenizing
+        todo = [
+            chunk for chunk in chunks
+            if 'input_ids' not in chunk or chunk.get('input_ids_text_hash') != hash(chunk['text'])
+        ]
+        if not todo:
+            return chunks
+
+        encoded = self.tokenizer(
+            [chunk['text'] for chunk in todo],
+            padding=False,
+            truncation=True,
+            max_length=self.max_seq_length
+        )
+        for chunk, ids, mask in zip(todo, encoded['input_ids'], encoded['attention_mask']):
+            chunk['input_ids'] = ids
+            chunk['attention_mask'] = mask
+            chunk['input_ids_text_hash'] = hash(chunk['text'])
+
+        return chunks
+
+    def embed_chunks(
+        self,
+        chunks: List[Dict],
+        batch_size: Optional[int] = None,
+        show_progress: bool = True
+    ) -> List[Dict]:
         """
         Add embeddings to chunk dictionaries.
 
+        The chunks are updated in place (like metadata_tagger.tag_chunks());
+        the same list is returned for convenience. Texts are tokenized once
+        with tokenize_chunks() and the model runs on those token ids.
+
         Args:
             chunks: List of chunk dictionaries from metadata_tagger
-            batch_size: Batch size for processing
+            batch_size: Batch size for processing (default: depends on device)
             show_progress: Show progress bar
 
         Returns:
-            List of chunks with 'embedding' field added
+            The input chunks, each with 'embedding' (and, except for the
+            fastembed backend, the tokenize_chunks() fields) added
 
         Example:
             >>> chunks = [{"text": "...", "state": "NC", ...}, ...]
@@ -104,22 +560,175 @@ class Embedder:
             >>> chunks_with_embeddings[0]['embedding'].shape
             (384,)
         """
+        embeddings = self._embed_chunk_texts(chunks, batch_size, show_progress)
+
+        # Add embeddings to chunks (in place, no per-chunk dict copy)
+        for chunk, embedding in zip(chunks, embeddings):
+            chunk['embedding'] = embedding
+
+        print(f"Embeddings generated: {embeddings.shape}")
+        return chunks
+
+    def embed_store(
+        self,
+        chunks: List[Dict],
+        batch_size: Optional[int] = None,
+        show_progress: bool = True
+    ) -> ChunkStore:
+        """
+        Embed chunks into a ChunkStore instead of attaching per-chunk vectors.
+
+        Same embeddings as embed_chunks(), but they stay in the single
+        matrix embed_texts() returns and the chunk dicts are left as
+        metadata only.
+
+        Args:
+            chunks: List of chunk dictionaries from metadata_tagger
+            batch_size: Batch size for processing (default: depends on device)
+            show_progress: Show progress bar
+
+        Returns:
+            ChunkStore with one embedding row per chunk
+
+        Example:
+            >>> store = embedder.embed_store(tag_chunks(chunks))
+            >>> store.embeddings.shape
+            (150, 384)
+            >>> index, metadata = build_index_from_chunks(store)
+        """
+        embeddings = self._embed_chunk_texts(chunks, batch_size, show_progress)
+        print(f"Embeddings generated: {embeddings.shape}")
+        return ChunkStore(embeddings=embeddings, meta=chunks)
+
+    def _embed_chunk_texts(
+        self,
+        chunks: List[Dict],
+        batch_size: Optional[int],
+        show_progress: bool
+    ) -> np.ndarray:
+        """Embed chunk texts, reusing token ids cached by tokenize_chunks()."""
         # Extract text from all chunks
         texts = [chunk['text'] for chunk in chunks]
 
+        # Tokenize once; the ids stay on the chunks for later stages
+        input_ids = None
+        if self.tokenizer is not None:
+            self.tokenize_chunks(chunks)
+            input_ids = [chunk['input_ids'] for chunk in chunks]
+
         # Generate embeddings for all texts
         print(f"Generating embeddings for {len(texts)} chunks...")
-        embeddings = self.embed_texts(texts, batch_size=batch_size, show_progress=show_progress)
+        return self.embed_texts(
+            texts,
+            batch_size=batch_size,
+            show_progress=show_progress,
+            input_ids=input_ids
+        )
+
+    def embed_stream(
+        self,
+        chunks: Iterable[Dict],
+        out_path: str,
+        batch_size: Optional[int] = None,
+        show_progress: bool = True
+    ) -> Tuple[np.ndarray, List[Dict]]:
+        """
+        Embed a stream of chunks, writing vectors straight to a file on disk.
 
-        # Add embeddings to chunks
-        chunks_with_embeddings = []
-        for i, chunk in enumerate(chunks):
-            chunk_copy = chunk.copy()
-            chunk_copy['embedding'] = embeddings[i]
-            chunks_with_embeddings.append(chunk_copy)
+        Chunks are consumed a window at a time: the embeddings are never all
+        in memory (rows are appended to out_path as raw bytes and returned
+        as a read-only memory map), and there is no separate list of every
+        text. The consumed chunk dicts themselves, text included, are kept
+        and returned, since they become the index metadata; memory for them
+        still grows with the number of chunks.
 
-        print(f"Embeddings generated: {embeddings.shape}")
-        return chunks_with_embeddings
+        Args:
+            chunks: Iterable of chunk dicts (e.g. chunker.iter_chunks())
+            out_path: File to write embeddings to (overwritten)
+            batch_size: Batch size for processing (default: depends on device)
+            show_progress: Print a progress line per window (default: True)
+
+        Returns:
+            Tuple of (embeddings, chunks):
+            - embeddings: read-only np.memmap of shape (num_chunks, dimension)
+            - chunks: the consumed chunk dicts, in row order (no 'embedding' field)
+
+        Raises:
+            ValueError: If the model returns vectors whose size isn't
+                self.dimension (the memmap shape would be wrong)
+
+        Example:
+            >>> embeddings, chunks = embedder.embed_stream(
+            ...     iter_chunks(pages), "data/processed/embeddings.bin"
+            ... )
+        """
+        if batch_size is None:
+            batch_size = self.default_batch_size
+        window_size = batch_size * STREAM_WINDOW_BATCHES
+
+        out_dir = os.path.dirname(out_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+        consumed = []
+        dtype = None
+        chunk_iter = iter(chunks)
+
+        with open(out_path, 'wb') as f:
+            while True:
+                window = list(islice(chunk_iter, window_size))
+                if not window:
+                    break
+
+                embeddings = self.embed_texts(
+                    [chunk['text'] for chunk in window],
+                    batch_size=batch_size,
+                    show_progress=False
+                )
+                if embeddings.shape[1] != self.dimension:
+                    raise ValueError(
+                        f"Model returned {embeddings.shape[1]}-dimensional embeddings, "
+                        f"expected {self.dimension}"
+                    )
+                f.write(np.ascontiguousarray(embeddings).tobytes())
+
+                dtype = embeddings.dtype
+                consumed.extend(window)
+                if show_progress:
+                    print(f"  Embedded {len(consumed)} chunks...")
+
+        if not consumed:
+            return self.embed_texts([]), consumed
+
+        embeddings = np.memmap(out_path, dtype=dtype, mode='r', shape=(len(consumed), self.dimension))
+        if show_progress:
+            print(f"Embeddings written to {out_path}: {embeddings.shape}")
+        return embeddings, consumed
+
+    def embed_batch(self, batch, batch_size: Optional[int] = None, show_progress: bool = True):
+        """
+        Embed a columnar chunker.ChunkBatch.
+
+        Sets batch.embeddings to one (num_chunks, dimension) matrix instead
+        of attaching a vector to every chunk dict.
+
+        Args:
+            batch: ChunkBatch from chunker.chunk_pages_batch()
+            batch_size: Batch size for processing (default: depends on device)
+            show_progress: Show progress bar
+
+        Returns:
+            The same ChunkBatch, with embeddings set
+
+        Example:
+            >>> batch = embedder.embed_batch(chunk_pages_batch(pages))
+            >>> batch.embeddings.shape
+            (150, 384)
+        """
+        print(f"Generating embeddings for {len(batch)} chunks...")
+        batch.embeddings = self.embed_texts(batch.texts, batch_size=batch_size, show_progress=show_progress)
+        print(f"Embeddings generated: {batch.embeddings.shape}")
+        return batch
 
     def get_embedding_dimension(self) -> int:
         """
@@ -131,17 +740,67 @@ class Embedder:
         return self.dimension
 
 
-def create_embedder(model_name: str = "sentence-transformers/all-MiniLM-L6-v2") -> Embedder:
+def _l2_normalize(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Scale embedding rows to unit length.
+
+    Args:
+        embeddings: Embedding vector or matrix (float32)
+
+    Returns:
+        Embeddings with L2 norm 1 along the last axis (zero rows stay zero)
+    """
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def _resolve_device(device: Optional[str]) -> str:
+    """
+    Pick the torch device for the model.
+
+    Args:
+        device: "cpu", "cuda", or None/"auto" to detect
+
+    Returns:
+        "cuda" if requested/available, else "cpu"
+    """
+    if device not in (None, "auto"):
+        return device
+
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def create_embedder(
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    quantize: str = "fp32",
+    backend: str = "torch",
+    device: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    normalize: bool = True
+) -> Embedder:
     """
     Factory function to create an Embedder instance.
 
     Args:
         model_name: HuggingFace model name
+        quantize: Output precision ("fp32", "fp16" or "int8")
+        backend: Inference engine ("torch", "onnx" or "fastembed")
+        device: "cpu", "cuda" or None/"auto" to detect
+        cache_dir: Directory for the on-disk embedding cache (None disables)
+        normalize: Return unit-length vectors (default: True)
 
     Returns:
         Initialized Embedder object
     """
-    return Embedder(model_name)
+    return Embedder(
+        model_name,
+        quantize=quantize,
+        backend=backend,
+        device=device,
+        cache_dir=cache_dir,
+        normalize=normalize
+    )
 
 
 def get_embedding_stats(embeddings: np.ndarray) -> Dict:
@@ -268,12 +927,9 @@ if __name__ == "__main__":
     emb2 = embedder.embed_text(text2)
     emb3 = embedder.embed_text(text3)
 
-    # Cosine similarity
-    def cosine_similarity(a, b):
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
-
-    sim_1_2 = cosine_similarity(emb1, emb2)
-    sim_1_3 = cosine_similarity(emb1, emb3)
+    # Embeddings are unit length, so the dot product is the cosine similarity
+    sim_1_2 = np.dot(emb1, emb2)
+    sim_1_3 = np.dot(emb1, emb3)
 
     print(f"\nText 1: {text1}")
     print(f"Text 2: {text2}")
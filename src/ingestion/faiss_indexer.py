@@ -13,10 +13,59 @@ import os
 import json
 import numpy as np
 import faiss
-from typing import List, Dict, Tuple
-
-
-def create_faiss_index(dimension: int, index_type: str = "flat") -> faiss.Index:
+from collections import Counter
+from functools import lru_cache
+from typing import List, Dict, Iterator, Optional, Tuple, Union
+
+# Optional fast JSON (de)serializer for .json metadata; stdlib json otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from .embedder import ChunkStore
+except ImportError:  # Run as a script: python src/ingestion/faiss_indexer.py
+    from embedder import ChunkStore
+
+# Chunk fields that are not saved as metadata: the vector itself and the
+# token ids Embedder.tokenize_chunks() caches for in-process reuse
+NON_METADATA_FIELDS = ("embedding", "input_ids", "attention_mask", "input_ids_text_hash")
+
+# Distance metrics supported by create_faiss_index(metric=...)
+METRIC_OPTIONS = {"ip": faiss.METRIC_INNER_PRODUCT, "l2": faiss.METRIC_L2}
+
+# Upper bound on vectors used to train IVF/PQ/OPQ. FAISS k-means only uses
+# 256 points per centroid, and PQ codebooks have up to 256 centroids, so
+# 256 * 256 covers nlist <= 256 with 8-bit PQ; more only slows training.
+MAX_TRAIN_POINTS = 256 * 256
+
+# IVF clusters visited per query by new IVF indexes (FAISS defaults to 1,
+# which misses neighbours in adjacent clusters). Saved with the index;
+# batch_search(nprobe=...) overrides it per call.
+DEFAULT_NPROBE = 16
+
+# build_index_from_chunks(nlist=None): one cluster per this many vectors
+# (FAISS k-means warns below 39 training points per centroid), capped
+MIN_POINTS_PER_LIST = 39
+MAX_AUTO_NLIST = 4096
+
+# Search implementations for batch_search(backend=...). "numpy" scores a
+# flat index's vectors directly with one matrix product instead of calling
+# index.search()
+SEARCH_BACKENDS = ("faiss", "numpy")
+
+
+def create_faiss_index(
+    dimension: int,
+    index_type: str = "flat",
+    nlist: int = 100,
+    m: int = 48,
+    nbits: Optional[int] = None,
+    use_gpu: bool = False,
+    use_cuvs: bool = False,
+    metric: str = "ip"
+) -> faiss.Index:
     """
     Create a FAISS index.
 
@@ -25,35 +74,244 @@ def create_faiss_index(dimension: int, index_type: str = "flat") -> faiss.Index:
         index_type: Type of index to create
             - "flat": Exact search (slower but perfect accuracy)
             - "ivf": Approximate search (faster but slightly less accurate)
+            - "ivfpq": IVF with 8-bit PQ codes (m bytes per vector),
+              re-ranked with exact distances
+            - "ivfpq_fs": IVF with 4-bit PQ Fast Scan codes, re-ranked with
+              exact distances (compact codes, SIMD distance scan)
+            - "opq_ivfpq": IVF-PQ with a learned OPQ rotation applied
+              before quantization (better recall per code byte)
+            - "sq8": Exact scan over 8-bit scalar-quantized vectors (4x
+              smaller than "flat", trained per-dimension ranges)
+            - "fp16": Exact scan over half-precision vectors (2x smaller)
+            - "cagra": cuVS CAGRA graph index, built and searched on GPU
+              (needs faiss built with cuVS)
+        nlist: Number of IVF clusters (IVF index types). Queries visit
+            DEFAULT_NPROBE of them (see batch_search(nprobe=...))
+        m: Number of PQ sub-quantizers; must divide dimension (PQ index types)
+        nbits: Bits per PQ code (PQ index types). None uses 8 for "ivfpq"
+            and "opq_ivfpq" and 4 for "ivfpq_fs", which only supports 4.
+            Fewer bits give smaller codes but coarser distances; training
+            needs at least 2**nbits vectors (ideally ~40x more).
+        use_gpu: Move the index to all available GPUs (needs faiss-gpu).
+            Training and search then run on the GPU. Falls back to CPU
+            when no GPU is found or the index type has no GPU version.
+        use_cuvs: With use_gpu and index_type "ivf", build the GPU IVF index
+            on NVIDIA cuVS kernels (needs faiss built with cuVS)
+        metric: Similarity measure
+            - "ip": Inner product; on L2-normalized vectors this is cosine
+              similarity, higher = more similar (default)
+            - "l2": Euclidean distance, lower = more similar
 
     Returns:
-        FAISS index object
+        FAISS index object (IVF indexes must be trained before adding vectors;
+        build_index_from_chunks() does this)
 
     Note:
         For Phase 1 with small data (<100k vectors), "flat" is recommended.
-        It's simple, accurate, and fast enough.
+        It's simple, accurate, and fast enough. IVF training needs at least
+        nlist vectors (ideally ~40x more).
     """
+    if metric not in METRIC_OPTIONS:
+        raise ValueError(f"Unknown metric: {metric}. Use one of {tuple(METRIC_OPTIONS)}")
+    faiss_metric = METRIC_OPTIONS[metric]
+
     if index_type == "flat":
-        # IndexFlatL2: Exact L2 (Euclidean) distance search
+        # IndexFlat: Exact inner product / L2 distance search
         # Best for: Small datasets, exact results needed
-        index = faiss.IndexFlatL2(dimension)
-        print(f"Created FAISS Flat index (dimension: {dimension})")
+        index = faiss.IndexFlat(dimension, faiss_metric)
+        print(f"Created FAISS Flat index (dimension: {dimension}, metric: {metric})")
+
+    elif index_type == "cagra":
+        # GpuIndexCagra: cuVS graph-based ANN, the fastest GPU search
+        # Best for: Large datasets on a GPU box. Trained (graph built)
+        # on the full data; save_index() stores it as a CPU HNSW graph.
+        if not hasattr(faiss, "GpuIndexCagra") or faiss.get_num_gpus() == 0:
+            raise ValueError("index_type 'cagra' needs a GPU and faiss built with cuVS")
+
+        index = faiss.GpuIndexCagra(_get_gpu_resources()[0], dimension, faiss_metric)
+        print(f"Created FAISS CAGRA GPU index (dimension: {dimension})")
+        return index
+
+    elif index_type in ("sq8", "fp16"):
+        # IndexScalarQuantizer: brute-force search like "flat", but each
+        # component is stored in 1 (sq8) or 2 (fp16) bytes instead of 4.
+        # Normalized embeddings have a small range, so little is lost.
+        # Best for: Small/medium datasets where index size matters
+        qtype = faiss.ScalarQuantizer.QT_8bit if index_type == "sq8" else faiss.ScalarQuantizer.QT_fp16
+        index = faiss.IndexScalarQuantizer(dimension, qtype, faiss_metric)
+        print(f"Created FAISS {index_type.upper()} scalar quantizer index (dimension: {dimension})")
+
+    elif index_type == "ivf" and use_gpu and use_cuvs and _has_cuvs_ivf():
+        # Same IVF-Flat index, built directly on GPU with cuVS kernels
+        co = faiss.GpuIndexIVFFlatConfig()
+        co.use_cuvs = True
+        index = faiss.GpuIndexIVFFlat(_get_gpu_resources()[0], dimension, nlist, faiss_metric, co)
+        index.nprobe = min(DEFAULT_NPROBE, nlist)
+        print(f"Created FAISS cuVS IVF GPU index (dimension: {dimension}, centroids: {nlist})")
+        print("Note: IVF index needs training before adding vectors")
+        return index
 
     elif index_type == "ivf":
         # IndexIVFFlat: Inverted file index (approximate search)
         # Best for: Large datasets (>100k vectors)
-        quantizer = faiss.IndexFlatL2(dimension)
-        n_centroids = 100  # Number of clusters
-        index = faiss.IndexIVFFlat(quantizer, dimension, n_centroids)
-        print(f"Created FAISS IVF index (dimension: {dimension}, centroids: {n_centroids})")
+        quantizer = faiss.IndexFlat(dimension, faiss_metric)
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss_metric)
+        print(f"Created FAISS IVF index (dimension: {dimension}, centroids: {nlist})")
+        print("Note: IVF index needs training before adding vectors")
+
+    elif index_type == "ivfpq":
+        # IVF + PQ: each vector stored as m nbits-bit codes (m bytes at the
+        # default 8 bits instead of 4*dimension, e.g. 16x smaller with m=96
+        # at dimension 384). RFlat keeps the raw vectors and re-ranks the
+        # top k * k_factor PQ candidates with exact distances, so recall
+        # stays close to "flat".
+        # Best for: Large datasets where the IVF lists don't fit in memory
+        if dimension % m != 0:
+            raise ValueError(f"m ({m}) must divide dimension ({dimension})")
+        if nbits is None:
+            nbits = 8
+
+        index = faiss.index_factory(dimension, f"IVF{nlist},PQ{m}x{nbits},RFlat", faiss_metric)
+        index.k_factor = 10
+        print(f"Created FAISS IVF-PQ index (dimension: {dimension}, "
+              f"centroids: {nlist}, PQ: {m}x{nbits} bits, refine: flat)")
+        print("Note: IVF index needs training before adding vectors")
+
+    elif index_type == "ivfpq_fs":
+        # IVF + PQ Fast Scan: each vector stored as m 4-bit codes (m/2 bytes
+        # instead of 4*dimension), distances computed with SIMD lookup
+        # tables. RFlat re-ranks the top k * k_factor candidates with exact
+        # distances to recover the accuracy PQ loses.
+        # Best for: Large datasets where search speed matters
+        if nbits is None:
+            nbits = 4
+        if nbits != 4:
+            raise ValueError(f"PQ Fast Scan only supports nbits=4, got {nbits}")
+        if dimension % m != 0:
+            raise ValueError(f"m ({m}) must divide dimension ({dimension})")
+
+        # index_factory wires up quantizer ownership for the nested indexes
+        index = faiss.index_factory(
+            dimension, f"IVF{nlist},PQ{m}x{nbits}fs,RFlat", faiss_metric
+        )
+        index.k_factor = 10
+        print(f"Created FAISS IVF-PQ Fast Scan index (dimension: {dimension}, "
+              f"centroids: {nlist}, PQ: {m}x{nbits} bits, refine: flat)")
+        print("Note: IVF index needs training before adding vectors")
+
+    elif index_type == "opq_ivfpq":
+        # OPQ learns a rotation of the vectors before product quantization,
+        # spreading variance evenly across the m sub-vectors so each PQ
+        # codebook loses less information. The rotation matrix is stored
+        # inside the index file by write_index().
+        # Best for: Large datasets where index size matters
+        if dimension % m != 0:
+            raise ValueError(f"m ({m}) must divide dimension ({dimension})")
+        if nbits is None:
+            nbits = 8
+
+        index = faiss.index_factory(dimension, f"OPQ{m},IVF{nlist},PQ{m}x{nbits}", faiss_metric)
+        print(f"Created FAISS OPQ + IVF-PQ index (dimension: {dimension}, "
+              f"centroids: {nlist}, PQ: {m}x{nbits} bits)")
         print("Note: IVF index needs training before adding vectors")
 
     else:
-        raise ValueError(f"Unknown index_type: {index_type}. Use 'flat' or 'ivf'")
+        raise ValueError(
+            f"Unknown index_type: {index_type}. "
+            "Use 'flat', 'sq8', 'fp16', 'ivf', 'ivfpq', 'ivfpq_fs', 'opq_ivfpq' or 'cagra'"
+        )
+
+    if index_type.startswith(("ivf", "opq_ivf")):
+        # Default for the new (still CPU) index; ParameterSpace reaches the
+        # IVF index inside pre-transform / refine wrappers, and the GPU
+        # copy below keeps the setting
+        faiss.ParameterSpace().set_index_parameter(index, "nprobe", min(DEFAULT_NPROBE, nlist))
+
+    if use_gpu:
+        index = _index_to_gpus(index)
 
     return index
 
 
+def _has_cuvs_ivf() -> bool:
+    """True if faiss has GPU support built with cuVS for IVF indexes."""
+    return (
+        faiss.get_num_gpus() > 0
+        and hasattr(faiss, "GpuIndexIVFFlatConfig")
+        and hasattr(faiss.GpuIndexIVFFlatConfig(), "use_cuvs")
+    )
+
+
+def should_use_gpu(device: Optional[str] = None) -> bool:
+    """
+    Decide whether to build an index on GPU (use_gpu) from a device setting.
+
+    Args:
+        device: "cpu", "cuda", or None/"auto" to use the GPU when faiss
+            finds one (never with faiss-cpu)
+
+    Returns:
+        True to pass use_gpu=True to build_index_from_chunks()
+
+    Example:
+        >>> index, metadata = build_index_from_chunks(
+        ...     store, use_gpu=should_use_gpu("auto"))
+    """
+    if device in (None, "auto"):
+        return faiss.get_num_gpus() > 0
+    if device not in ("cpu", "cuda"):
+        raise ValueError(f"Unknown index device: {device}. Use 'auto', 'cpu' or 'cuda'")
+    return device == "cuda"
+
+
+@lru_cache(maxsize=1)
+def _get_gpu_resources() -> Tuple:
+    """
+    One StandardGpuResources per GPU, created once and shared by every index.
+
+    Each one holds cuBLAS handles, CUDA streams and a pinned-memory pool;
+    reusing them avoids setting those up again for every index built or
+    loaded in the process. Cached for the life of the process, so GPU
+    indexes never outlive their resources.
+    """
+    return tuple(faiss.StandardGpuResources() for _ in range(faiss.get_num_gpus()))
+
+
+def _index_to_gpus(index: faiss.Index) -> faiss.Index:
+    """
+    Copy a CPU index to all GPUs, or return it unchanged if that's not possible.
+
+    Args:
+        index: CPU FAISS index
+
+    Returns:
+        GPU index (replicated across GPUs), or the original CPU index
+    """
+    num_gpus = faiss.get_num_gpus()
+    if num_gpus == 0:
+        print("WARNING: use_gpu set but no GPU available, using CPU index")
+        return index
+
+    # Full replica on each GPU (shard=False); queries are split between them
+    co = faiss.GpuMultipleClonerOptions()
+    co.shard = False
+
+    try:
+        gpu_index = faiss.index_cpu_to_gpu_multiple_py(list(_get_gpu_resources()), index, co)
+    except (RuntimeError, AttributeError) as e:
+        # e.g. PQ Fast Scan and refine indexes have no GPU implementation
+        print(f"WARNING: Index type not supported on GPU, using CPU index ({e})")
+        return index
+
+    print(f"Moved FAISS index to {num_gpus} GPU(s)")
+    return gpu_index
+
+
+def _is_gpu_index(index: faiss.Index) -> bool:
+    """True for indexes made by _index_to_gpus() (one GPU or replicas)."""
+    return type(index).__name__.startswith("Gpu") or isinstance(index, faiss.IndexReplicas)
+
+
 def add_embeddings_to_index(
     index: faiss.Index,
     embeddings: np.ndarray
@@ -63,7 +321,9 @@ def add_embeddings_to_index(
 
     Args:
         index: FAISS index object
-        embeddings: numpy array of shape (num_vectors, dimension)
+        embeddings: Array of shape (num_vectors, dimension). Converted to
+            C-contiguous float32 if needed; build_index_from_chunks()
+            already produces that layout, so its matrix is not copied.
 
     Returns:
         Updated FAISS index
@@ -75,9 +335,9 @@ def add_embeddings_to_index(
         >>> index.ntotal
         100
     """
-    # FAISS requires float32
-    if embeddings.dtype != np.float32:
-        embeddings = embeddings.astype('float32')
+    # FAISS requires C-contiguous float32; a no-op (no copy) when the
+    # input already is
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
 
     # Add vectors to index
     index.add(embeddings)
@@ -89,17 +349,42 @@ def add_embeddings_to_index(
 
 
 def build_index_from_chunks(
-    chunks: List[Dict],
+    chunks: Union[List[Dict], ChunkStore],
     dimension: int = 384,
-    index_type: str = "flat"
+    index_type: str = "flat",
+    use_gpu: bool = False,
+    metric: str = "ip",
+    **index_kwargs
 ) -> Tuple[faiss.Index, List[Dict]]:
     """
     Build FAISS index from chunks with embeddings.
 
+    Accepts either chunk dicts with an 'embedding' field or a ChunkStore
+    from Embedder.embed_store() / embed_stream(). The caller's embeddings
+    are never modified: with metric="l2" a float32 ChunkStore matrix
+    (including a read-only memmap) is passed to FAISS without copying.
+
+    With metric="ip" the embeddings are L2-normalized so inner product
+    equals cosine similarity. A ChunkStore's matrix is copied for this.
+    For Embedder(normalize=True) output the normalization changes nothing.
+
+    Indexes that need training (IVF, PQ, OPQ, SQ8) are trained on a random
+    sample of at most MAX_TRAIN_POINTS chunk embeddings (or 256 per IVF
+    cluster, if more) before they are added. With nlist=None, IVF indexes
+    get one cluster per MIN_POINTS_PER_LIST chunks (at most
+    MAX_AUTO_NLIST), so training always has enough points per cluster.
+    IVF-PQ ("ivfpq") keeps m bytes of PQ code per vector and re-ranks the
+    PQ candidates with exact distances; recall against "flat" depends on
+    nprobe (DEFAULT_NPROBE clusters are searched).
+
     Args:
-        chunks: List of chunk dicts with 'embedding' field
+        chunks: List of chunk dicts with 'embedding' field, or a ChunkStore
         dimension: Embedding dimension
         index_type: Type of FAISS index
+        use_gpu: Build (train + add) on GPU when one is available
+        metric: "ip" (cosine on normalized vectors, default) or "l2"
+        **index_kwargs: Passed to create_faiss_index() (nlist, m, nbits,
+            use_cuvs); nlist=None picks it from the number of chunks
 
     Returns:
         Tuple of (faiss_index, metadata_list)
@@ -110,31 +395,160 @@ def build_index_from_chunks(
         ...     {"text": "...", "embedding": np.array([...]), "state": "NC"}
         ... ]
         >>> index, metadata = build_index_from_chunks(chunks)
+        >>> index, metadata = build_index_from_chunks(embedder.embed_store(chunks))
     """
-    if not chunks:
+    if not len(chunks):
         raise ValueError("No chunks provided")
 
-    if 'embedding' not in chunks[0]:
+    if isinstance(chunks, ChunkStore):
+        if metric == "ip":
+            # normalize_L2() below writes in place: work on a copy, since
+            # the store's matrix belongs to the caller and may be a
+            # read-only memmap (embed_stream())
+            embeddings = np.array(chunks.embeddings, dtype=np.float32, order='C')
+        else:
+            # Already one matrix; only widened if it isn't float32
+            embeddings = np.ascontiguousarray(chunks.embeddings, dtype=np.float32)
+        if embeddings.shape != (len(chunks), dimension):
+            raise ValueError(
+                f"ChunkStore embeddings have shape {embeddings.shape}, "
+                f"expected ({len(chunks)}, {dimension})"
+            )
+        metadata = [
+            {k: v for k, v in meta.items() if k not in NON_METADATA_FIELDS}
+            for meta in chunks.meta
+        ]
+
+    elif 'embedding' not in chunks[0]:
         raise ValueError("Chunks must have 'embedding' field. Run embedder first.")
 
-    # Extract embeddings
-    embeddings = np.array([chunk['embedding'] for chunk in chunks])
+    else:
+        # One pass over the chunks: copy each embedding straight into one
+        # float32 matrix (no intermediate list of arrays, no float64 buffer,
+        # no second cast for FAISS) and keep everything except the embedding
+        # and token ids as metadata
+        embeddings = np.empty((len(chunks), dimension), dtype=np.float32)
+        metadata = [None] * len(chunks)
+        for i, chunk in enumerate(chunks):
+            np.copyto(embeddings[i], chunk['embedding'], casting='unsafe')
+            metadata[i] = {k: v for k, v in chunk.items() if k not in NON_METADATA_FIELDS}
+
+    # Cosine similarity is the inner product of unit vectors. embeddings
+    # is always a matrix built (or copied) above, so this is safe in place
+    if metric == "ip":
+        faiss.normalize_L2(embeddings)
+
+    if index_kwargs.get('nlist', 0) is None:
+        index_kwargs['nlist'] = max(1, min(len(embeddings) // MIN_POINTS_PER_LIST, MAX_AUTO_NLIST))
 
     # Create index
-    index = create_faiss_index(dimension, index_type)
+    index = create_faiss_index(dimension, index_type, use_gpu=use_gpu, metric=metric, **index_kwargs)
+
+    # CAGRA builds its graph from the full data in train(); there is no
+    # separate add step
+    if index_type == "cagra":
+        print(f"Building CAGRA graph on {len(embeddings)} vectors...")
+        index.train(embeddings)
+        print(f"Total vectors in index: {index.ntotal}")
+
+    # Train IVF/PQ indexes on the data they will hold
+    elif not index.is_trained:
+        # k-means samples 256 points per centroid itself; PQ codebooks
+        # need MAX_TRAIN_POINTS
+        max_train = max(MAX_TRAIN_POINTS, 256 * index_kwargs.get('nlist', 0))
+        train_set = embeddings
+        if len(embeddings) > max_train:
+            rng = np.random.default_rng(0)
+            train_set = embeddings[rng.choice(len(embeddings), max_train, replace=False)]
+        print(f"Training index on {len(train_set)} vectors...")
+        index.train(train_set)
 
     # Add embeddings
-    index = add_embeddings_to_index(index, embeddings)
-
-    # Prepare metadata (everything except embedding)
-    metadata = []
-    for chunk in chunks:
-        meta = {k: v for k, v in chunk.items() if k != 'embedding'}
-        metadata.append(meta)
+    if index_type != "cagra":
+        index = add_embeddings_to_index(index, embeddings)
 
     return index, metadata
 
 
+# Metadata file extensions stored column-wise with pyarrow (anything else is JSON)
+COLUMNAR_METADATA_EXTENSIONS = ('.parquet', '.arrow')
+
+
+class ArrowMetadata:
+    """
+    Read-only, list-like view of metadata stored in a Parquet or Arrow file.
+
+    Metadata is kept as one Arrow column per field instead of one Python
+    dict per chunk, so loading doesn't build millions of dicts and rows are
+    only decoded when accessed. Arrow IPC files are memory-mapped without
+    any decoding, so processes serving the same index share the pages.
+    Supports what search_index() and get_index_stats() need: len(),
+    metadata[i] (a new dict) and iteration.
+
+    Attributes:
+        table: The pyarrow.Table holding the metadata columns
+    """
+
+    def __init__(self, path: str):
+        import pyarrow as pa
+
+        self.path = path
+        if path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            self.table = pq.read_table(path, memory_map=True)
+        else:
+            self.table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def __getitem__(self, i: int) -> Dict:
+        # slice() is zero-copy; only this row is converted to Python
+        return self.table.slice(int(i), 1).to_pylist()[0]
+
+    def __iter__(self) -> Iterator[Dict]:
+        for batch in self.table.to_batches():
+            yield from batch.to_pylist()
+
+    def value_counts(self, field: str, default: str = 'unknown') -> Dict:
+        """Count values of one column; nulls and a missing column count as default."""
+        import pyarrow.compute as pc
+
+        if field not in self.table.column_names:
+            return {default: len(self)} if len(self) else {}
+
+        column = self.table.column(field)
+        if column.null_count:
+            column = pc.fill_null(column, default)
+        return {
+            item['values']: item['counts']
+            for item in pc.value_counts(column).to_pylist()
+        }
+
+
+def _write_columnar_metadata(metadata: List[Dict], path: str) -> None:
+    """
+    Write metadata dicts as a Parquet or Arrow IPC file (one column per key).
+
+    Keys missing from some dicts are stored as nulls and read back as None.
+    """
+    import pyarrow as pa
+
+    keys = list(dict.fromkeys(k for meta in metadata for k in meta))
+    table = pa.table({k: [meta.get(k) for meta in metadata] for k in keys})
+
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        # zstd: noticeably smaller than the default snappy on chunk text,
+        # at about the same read/write speed
+        pq.write_table(table, path, compression='zstd')
+        return
+
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
 def save_index(
     index: faiss.Index,
     metadata: List[Dict],
@@ -150,11 +564,17 @@ def save_index(
         metadata: List of metadata dictionaries
         output_dir: Directory to save files
         index_name: Name of FAISS index file
-        metadata_name: Name of metadata file
+        metadata_name: Name of metadata file. ".parquet" or ".arrow" names
+            write a columnar file (needs pyarrow); anything else is
+            written as JSON. Arrow IPC loads fastest (memory-mapped),
+            Parquet is smallest on disk.
+
+    GPU indexes are copied back to CPU first, since write_index() can
+    only serialize CPU indexes.
 
     Saves:
         - {output_dir}/{index_name}: FAISS index (binary)
-        - {output_dir}/{metadata_name}: Metadata (JSON)
+        - {output_dir}/{metadata_name}: Metadata (JSON, Parquet or Arrow)
 
     Example:
         >>> save_index(index, metadata, "data/processed")
@@ -166,14 +586,27 @@ def save_index(
     os.makedirs(output_dir, exist_ok=True)
 
     # Save FAISS index
+    if _is_gpu_index(index):
+        index = faiss.index_gpu_to_cpu(index)
+
     index_path = os.path.join(output_dir, index_name)
     faiss.write_index(index, index_path)
     print(f"Saved FAISS index to: {index_path}")
 
     # Save metadata
     metadata_path = os.path.join(output_dir, metadata_name)
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    if metadata_name.endswith(COLUMNAR_METADATA_EXTENSIONS):
+        _write_columnar_metadata(metadata, metadata_path)
+    elif orjson is not None:
+        # Serialized to UTF-8 bytes in C instead of one Python-level
+        # write per token; numpy values (e.g. from a ChunkStore) are
+        # written natively instead of failing
+        option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        with open(metadata_path, 'wb') as f:
+            f.write(orjson.dumps(metadata, option=option))
+    else:
+        with open(metadata_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
     print(f"Saved metadata to: {metadata_path}")
 
     # Print statistics
@@ -186,17 +619,22 @@ def save_index(
 
 def load_index(
     index_path: str,
-    metadata_path: str
-) -> Tuple[faiss.Index, List[Dict]]:
+    metadata_path: str,
+    mmap: bool = False
+) -> Tuple[faiss.Index, Union[List[Dict], ArrowMetadata]]:
     """
     Load FAISS index and metadata from disk.
 
     Args:
         index_path: Path to FAISS index file
-        metadata_path: Path to metadata JSON file
+        metadata_path: Path to metadata file (JSON, ".parquet" or ".arrow")
+        mmap: Memory-map the index instead of reading it into RAM. The
+            index is read-only and its pages are loaded on demand and
+            shared between processes (e.g. several serving workers).
 
     Returns:
-        Tuple of (faiss_index, metadata_list)
+        Tuple of (faiss_index, metadata). Metadata is a list of dicts for
+        JSON, or an ArrowMetadata view for Parquet/Arrow files.
 
     Example:
         >>> index, metadata = load_index(
@@ -210,7 +648,16 @@ def load_index(
     if not os.path.exists(index_path):
         raise FileNotFoundError(f"Index file not found: {index_path}")
 
-    index = faiss.read_index(index_path)
+    if mmap:
+        # MMAP_IFC maps the vectors/codes in place (zero-copy); older faiss
+        # versions only support the plain mmap flag
+        if hasattr(faiss, 'IO_FLAG_MMAP_IFC'):
+            flags = faiss.IO_FLAG_MMAP_IFC
+        else:
+            flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        index = faiss.read_index(index_path, flags)
+    else:
+        index = faiss.read_index(index_path)
     print(f"Loaded FAISS index from: {index_path}")
     print(f"Total vectors: {index.ntotal}")
 
@@ -218,8 +665,14 @@ def load_index(
     if not os.path.exists(metadata_path):
         raise FileNotFoundError(f"Metadata file not found: {metadata_path}")
 
-    with open(metadata_path, 'r') as f:
-        metadata = json.load(f)
+    if metadata_path.endswith(COLUMNAR_METADATA_EXTENSIONS):
+        metadata = ArrowMetadata(metadata_path)
+    elif orjson is not None:
+        with open(metadata_path, 'rb') as f:
+            metadata = orjson.loads(f.read())
+    else:
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
     print(f"Loaded metadata from: {metadata_path}")
     print(f"Total metadata entries: {len(metadata)}")
 
@@ -232,26 +685,39 @@ def load_index(
 
 def search_index(
     index: faiss.Index,
-    metadata: List[Dict],
     query_embedding: np.ndarray,
-    top_k: int = 5
+    top_k: int = 5,
+    backend: str = "faiss"
 ) -> List[Dict]:
     """
     Search FAISS index for similar vectors.
 
+    For inner-product indexes the query is L2-normalized first, so the
+    score is cosine similarity (higher = more similar). For L2 indexes the
+    score is the squared L2 distance (lower = more similar).
+
+    Results only carry the row number ('idx') into the metadata, not a copy
+    of the chunk; pass them to hydrate_results() when the chunk fields
+    (text, state, ...) are needed.
+
     Args:
         index: FAISS index
-        metadata: Metadata list
-        query_embedding: Query vector (shape: (dimension,))
+        query_embedding: Query vector (shape: (dimension,)); any array-like
+            (e.g. a CPU tensor) is converted to float32. It is not modified.
+            Passing the metadata list here (the old signature) raises
+            TypeError.
         top_k: Number of results to return
+        backend: "faiss" (default) or "numpy" (flat indexes; see batch_search())
 
     Returns:
-        List of top K results with metadata and scores
+        List of top K results ({'idx', 'score', 'rank'}), best first
 
     Example:
         >>> query_emb = embedder.embed_text("Is metformin covered?")
-        >>> results = search_index(index, metadata, query_emb, top_k=5)
+        >>> results = search_index(index, query_emb, top_k=5)
         >>> results[0]
+        {'idx': 42, 'score': 0.95, 'rank': 0}
+        >>> hydrate_results(results, metadata)[0]
         {
             'text': '...',
             'state': 'NC',
@@ -259,29 +725,264 @@ def search_index(
             'rank': 0
         }
     """
-    # Ensure correct shape and type
-    if query_embedding.ndim == 1:
-        query_embedding = query_embedding.reshape(1, -1)
+    # Old signature was search_index(index, metadata, query_embedding, k);
+    # fail clearly instead of searching with the metadata as the query
+    if isinstance(query_embedding, (list, tuple, ArrowMetadata)) and len(query_embedding) \
+            and isinstance(query_embedding[0], dict):
+        raise TypeError(
+            "search_index() no longer takes metadata: call "
+            "search_index(index, query_embedding, top_k) and pass the "
+            "results to hydrate_results(results, metadata)"
+        )
+
+    # batch_search() makes the one float32 (1, dimension) copy
+    return batch_search(index, query_embedding, top_k, backend=backend)[0]
+
+
+def batch_search(
+    index: faiss.Index,
+    queries: np.ndarray,
+    top_k: int = 5,
+    nprobe: Optional[int] = None,
+    backend: str = "faiss"
+) -> List[List[Dict]]:
+    """
+    Search FAISS index for many queries with a single index.search() call.
+
+    One call lets FAISS share work across queries (PQ lookup tables,
+    BLAS matrix products, GPU batches) instead of paying it per query.
+    Scores follow search_index().
 
-    if query_embedding.dtype != np.float32:
-        query_embedding = query_embedding.astype('float32')
+    Args:
+        index: FAISS index
+        queries: Query matrix (shape: (num_queries, dimension)). Converted
+            to C-contiguous float32; not modified.
+        top_k: Number of results per query
+        nprobe: IVF clusters to visit per query, for this call only (the
+            index's own setting is left unchanged). None uses the index's
+            setting; ignored by indexes without IVF lists.
+        backend: "faiss" (default) or "numpy". "numpy" (flat CPU indexes
+            only) reads the index's vectors in place and searches them with
+            search_embeddings(); same results as "faiss".
+
+    Returns:
+        One list of results per query (same format as search_index())
+
+    Example:
+        >>> query_embs = embedder.embed_texts(questions)
+        >>> all_results = batch_search(index, query_embs, top_k=5)
+        >>> all_results[0][0]['rank']
+        0
+    """
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}. Use one of {SEARCH_BACKENDS}")
+
+    if backend == "numpy":
+        metric = "ip" if index.metric_type == faiss.METRIC_INNER_PRODUCT else "l2"
+        return search_embeddings(_flat_vectors(index), queries, top_k, metric)
+
+    # FAISS needs C-contiguous float32. np.array copies, so normalizing
+    # below leaves the caller's array alone
+    queries = np.array(queries, dtype=np.float32, ndmin=2, order='C')
+
+    if index.metric_type == faiss.METRIC_INNER_PRODUCT:
+        faiss.normalize_L2(queries)
 
     # Search index
-    # Returns: distances and indices of top K nearest neighbors
-    distances, indices = index.search(query_embedding, top_k)
+    # Returns: distances and indices of top K nearest neighbors per query
+    distances, indices = _search_with_nprobe(index, queries, top_k, nprobe)
+
+    return _to_results(indices, distances)
+
 
-    # Convert to results with metadata
-    results = []
-    for rank, (idx, distance) in enumerate(zip(indices[0], distances[0])):
-        if idx == -1:  # FAISS returns -1 for invalid results
-            continue
+def _search_with_nprobe(
+    index: faiss.Index,
+    queries: np.ndarray,
+    top_k: int,
+    nprobe: Optional[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    index.search() with nprobe applied to this call only.
+
+    CPU and single-GPU indexes get per-call SearchParameters. Replicated
+    (multi-GPU) indexes don't accept them, so nprobe is set on every
+    replica for the search and the previous value is put back afterwards.
+    """
+    old_nprobe = None if nprobe is None else _get_nprobe(index)
+    if old_nprobe is None:
+        # No override, or no IVF lists for nprobe to apply to
+        return index.search(queries, top_k)
+
+    params = _ivf_search_params(index, nprobe)
+    if params is not None:
+        return index.search(queries, top_k, params=params)
+
+    # CPU-only builds have no GpuParameterSpace (nor GPU replicas)
+    space_cls = getattr(faiss, "GpuParameterSpace", faiss.ParameterSpace)
+    space = space_cls() if _is_gpu_index(index) else faiss.ParameterSpace()
+    space.set_index_parameter(index, "nprobe", nprobe)
+    try:
+        return index.search(queries, top_k)
+    finally:
+        space.set_index_parameter(index, "nprobe", old_nprobe)
+
+
+def _get_nprobe(index: faiss.Index) -> Optional[int]:
+    """Current nprobe of the IVF index inside any wrappers, or None."""
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexReplicas):
+        return _get_nprobe(index.at(0)) if index.count() else None
+    if isinstance(index, faiss.IndexRefine):
+        return _get_nprobe(index.base_index)
+    if isinstance(index, faiss.IndexPreTransform):
+        return _get_nprobe(index.index)
+    return getattr(index, "nprobe", None)
+
+
+def _ivf_search_params(index: faiss.Index, nprobe: int):
+    """
+    SearchParameters setting nprobe, nested to match the index's wrappers.
+
+    Returns None for replicated indexes, which take no search parameters.
+    """
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexReplicas):
+        return None
+    if isinstance(index, faiss.IndexRefine):
+        base_params = _ivf_search_params(index.base_index, nprobe)
+        if base_params is None:
+            return None
+        params = faiss.IndexRefineSearchParameters(
+            base_index_params=base_params,
+            k_factor=index.k_factor
+        )
+        # The C++ struct only holds a pointer; keep the Python object alive
+        params.referenced_objects = [base_params]
+        return params
+    if isinstance(index, faiss.IndexPreTransform):
+        # Forwards the parameters to the wrapped index as they are
+        return _ivf_search_params(index.index, nprobe)
+    return faiss.SearchParametersIVF(nprobe=nprobe)
+
+
+def search_embeddings(
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    top_k: int = 5,
+    metric: str = "ip"
+) -> List[List[Dict]]:
+    """
+    Exact top-k search over an embedding matrix with numpy, without FAISS.
+
+    Scores every vector with one BLAS matrix product, then picks the top k
+    per query with np.argpartition (linear time) and sorts only those k.
+    Returns the same results and scores as a flat FAISS index with the
+    same metric, so small corpora held in a ChunkStore can be searched
+    without building an index at all.
+
+    Args:
+        embeddings: Matrix of stored vectors (shape: (num_vectors, dimension)),
+            e.g. ChunkStore.embeddings. With metric="ip" it must already be
+            L2-normalized (build_index_from_chunks() does this).
+        queries: Query vector or matrix (shape: (num_queries, dimension));
+            not modified
+        top_k: Number of results per query
+        metric: "ip" (cosine, higher = more similar) or "l2" (squared
+            Euclidean distance, lower = more similar)
+
+    Returns:
+        One list of results per query (same format as search_index());
+        'idx' is the row in embeddings
+
+    Example:
+        >>> store = embedder.embed_store(chunks)
+        >>> results = search_embeddings(store.embeddings, query_embs)
+        >>> hydrate_results(results[0], store.meta)
+    """
+    if metric not in METRIC_OPTIONS:
+        raise ValueError(f"Unknown metric: {metric}. Use one of {tuple(METRIC_OPTIONS)}")
+
+    queries = np.array(queries, dtype=np.float32, ndmin=2, order='C')
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    k = min(top_k, len(embeddings))
 
-        result = metadata[idx].copy()
-        result['score'] = float(distance)  # L2 distance
-        result['rank'] = rank
-        results.append(result)
+    if metric == "ip":
+        faiss.normalize_L2(queries)
+        # Negated so that smaller is better for both metrics
+        scores = -(queries @ embeddings.T)
+    else:
+        # ||x - q||^2 = ||x||^2 - 2 x.q + ||q||^2
+        scores = queries @ embeddings.T
+        scores *= -2
+        scores += np.einsum('ij,ij->i', embeddings, embeddings)
+        scores += np.einsum('ij,ij->i', queries, queries)[:, None]
+
+    # Plain fancy indexing; np.take_along_axis costs more per call at
+    # these sizes
+    rows = np.arange(len(queries))[:, None]
+    if k < len(embeddings):
+        top = np.argpartition(scores, k - 1, axis=1)[:, :k]
+    else:
+        top = np.broadcast_to(np.arange(len(embeddings)), (len(queries), k))
+    top_scores = scores[rows, top]
+    order = np.argsort(top_scores, axis=1, kind='stable')
+    indices = top[rows, order]
+    distances = top_scores[rows, order]
+
+    if metric == "ip":
+        distances = -distances
+
+    return _to_results(indices, distances)
+
+
+def _flat_vectors(index: faiss.Index) -> np.ndarray:
+    """Zero-copy (ntotal, d) view of the vectors stored in a flat CPU index."""
+    if not isinstance(index, faiss.IndexFlat):
+        raise ValueError(
+            f"backend 'numpy' needs a flat CPU index, got {type(index).__name__}"
+        )
+    if index.ntotal == 0:
+        return np.empty((0, index.d), dtype=np.float32)
+    return faiss.rev_swig_ptr(index.get_xb(), index.ntotal * index.d).reshape(index.ntotal, index.d)
+
+
+def _to_results(indices: np.ndarray, distances: np.ndarray) -> List[List[Dict]]:
+    """Turn per-query (indices, distances) rows into ranked result dicts."""
+    # tolist() converts each whole row to Python ints/floats in one call
+    return [
+        [
+            # Score: cosine similarity (IP) or L2 distance
+            {'idx': idx, 'score': distance, 'rank': rank}
+            for rank, (idx, distance) in enumerate(zip(query_indices, query_distances))
+            if idx != -1  # FAISS returns -1 for invalid results
+        ]
+        for query_indices, query_distances in zip(indices.tolist(), distances.tolist())
+    ]
 
-    return results
+
+def hydrate_results(results: List[Dict], metadata: List[Dict]) -> List[Dict]:
+    """
+    Attach chunk metadata to search results, for display or prompting.
+
+    Search only returns row numbers and scores, so chunk dicts (which
+    include the full text) are copied just for the results actually used.
+
+    Args:
+        results: Results of one query from search_index() / batch_search()
+        metadata: Metadata list (or ArrowMetadata) loaded with the index
+
+    Returns:
+        New dicts with the chunk's metadata plus 'score' and 'rank'
+
+    Example:
+        >>> results = search_index(index, query_emb, top_k=5)
+        >>> hydrate_results(results, metadata)[0]['text']
+        'Metformin is covered as Tier 1...'
+    """
+    return [
+        {**metadata[r['idx']], 'score': r['score'], 'rank': r['rank']}
+        for r in results
+    ]
 
 
 def get_index_stats(index: faiss.Index, metadata: List[Dict]) -> Dict:
@@ -295,17 +996,13 @@ def get_index_stats(index: faiss.Index, metadata: List[Dict]) -> Dict:
     Returns:
         Dictionary with statistics
     """
-    # Count by state
-    states = {}
-    for meta in metadata:
-        state = meta.get('state', 'unknown')
-        states[state] = states.get(state, 0) + 1
-
-    # Count by doc_type
-    doc_types = {}
-    for meta in metadata:
-        doc_type = meta.get('doc_type', 'unknown')
-        doc_types[doc_type] = doc_types.get(doc_type, 0) + 1
+    if isinstance(metadata, ArrowMetadata):
+        # Counted inside Arrow, without converting rows to dicts
+        states = metadata.value_counts('state')
+        doc_types = metadata.value_counts('doc_type')
+    else:
+        states = dict(Counter(meta.get('state', 'unknown') for meta in metadata))
+        doc_types = dict(Counter(meta.get('doc_type', 'unknown') for meta in metadata))
 
     return {
         'total_vectors': index.ntotal,
@@ -404,7 +1101,10 @@ if __name__ == "__main__":
     # Search test
     print("\n7. Testing search...")
     query_embedding = np.random.rand(384).astype('float32')
-    results = search_index(loaded_index, loaded_metadata, query_embedding, top_k=3)
+    results = hydrate_results(
+        search_index(loaded_index, query_embedding, top_k=3),
+        loaded_metadata
+    )
 
     print(f"\nTop 3 search results:")
     for result in results:
@@ -412,7 +1112,7 @@ if __name__ == "__main__":
         print(f"    Text: {result['text'][:60]}...")
         print(f"    State: {result['state']}")
         print(f"    Doc Type: {result['doc_type']}")
-        print(f"    Score (L2 distance): {result['score']:.4f}")
+        print(f"    Score (cosine similarity): {result['score']:.4f}")
 
     # Clean up test files
     print("\n8. Cleaning up test files...")
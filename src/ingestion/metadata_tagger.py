@@ -12,13 +12,62 @@ Metadata includes:
 """
 
 import re
+from collections import Counter
+from functools import lru_cache
 from typing import List, Dict, Optional
 
 
+# State abbreviations (all 50 US states)
+STATES = [
+    'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
+    'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
+    'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
+    'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
+    'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY'
+]
+
+# State name to abbreviation mapping (common ones)
+STATE_NAMES = {
+    'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR',
+    'california': 'CA', 'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE',
+    'florida': 'FL', 'georgia': 'GA', 'hawaii': 'HI', 'idaho': 'ID',
+    'illinois': 'IL', 'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS',
+    'kentucky': 'KY', 'louisiana': 'LA', 'maine': 'ME', 'maryland': 'MD',
+    'massachusetts': 'MA', 'michigan': 'MI', 'minnesota': 'MN', 'mississippi': 'MS',
+    'missouri': 'MO', 'montana': 'MT', 'nebraska': 'NE', 'nevada': 'NV',
+    'new hampshire': 'NH', 'new jersey': 'NJ', 'new mexico': 'NM', 'new york': 'NY',
+    'north carolina': 'NC', 'north dakota': 'ND', 'ohio': 'OH', 'oklahoma': 'OK',
+    'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI', 'south carolina': 'SC',
+    'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT',
+    'vermont': 'VT', 'virginia': 'VA', 'washington': 'WA', 'west virginia': 'WV',
+    'wisconsin': 'WI', 'wyoming': 'WY'
+}
+
+# All state codes in one pattern: a code as a separate word ("NC-formulary",
+# "-NC-", "-NC.") or between underscores / before the extension ("_NC_",
+# "_NC."). Underscores are word characters, so \b alone misses those.
+_STATE_ALTERNATION = '|'.join(STATES)
+_STATE_RE = re.compile(
+    rf'\b({_STATE_ALTERNATION})\b|(?<=_)({_STATE_ALTERNATION})(?=[_.])'
+)
+
+# All full state names, longest first so "west virginia" wins over "virginia"
+_STATE_NAME_RE = re.compile(
+    '|'.join(re.escape(name) for name in sorted(STATE_NAMES, key=len, reverse=True))
+)
+
+# When several states appear, the one listed first above wins
+_STATE_ORDER = {state: i for i, state in enumerate(STATES)}
+_STATE_NAME_ORDER = {name: i for i, name in enumerate(STATE_NAMES)}
+
+
+@lru_cache(maxsize=1024)
 def extract_state_from_filename(filename: str) -> Optional[str]:
     """
     Extract state code from filename.
 
+    Results are cached: every chunk of a PDF has the same source filename.
+
     Common patterns:
     - "NC-formulary.pdf" -> "NC"
     - "Oscar_4T_NC_STND_Member_Doc.pdf" -> "NC"
@@ -30,54 +79,26 @@ def extract_state_from_filename(filename: str) -> Optional[str]:
     Returns:
         Two-letter state code (uppercase) or None if not found
     """
-    # State abbreviations (all 50 US states)
-    states = [
-        'AL', 'AK', 'AZ', 'AR', 'CA', 'CO', 'CT', 'DE', 'FL', 'GA',
-        'HI', 'ID', 'IL', 'IN', 'IA', 'KS', 'KY', 'LA', 'ME', 'MD',
-        'MA', 'MI', 'MN', 'MS', 'MO', 'MT', 'NE', 'NV', 'NH', 'NJ',
-        'NM', 'NY', 'NC', 'ND', 'OH', 'OK', 'OR', 'PA', 'RI', 'SC',
-        'SD', 'TN', 'TX', 'UT', 'VT', 'VA', 'WA', 'WV', 'WI', 'WY'
-    ]
-
-    # State name to abbreviation mapping (common ones)
-    state_names = {
-        'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR',
-        'california': 'CA', 'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE',
-        'florida': 'FL', 'georgia': 'GA', 'hawaii': 'HI', 'idaho': 'ID',
-        'illinois': 'IL', 'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS',
-        'kentucky': 'KY', 'louisiana': 'LA', 'maine': 'ME', 'maryland': 'MD',
-        'massachusetts': 'MA', 'michigan': 'MI', 'minnesota': 'MN', 'mississippi': 'MS',
-        'missouri': 'MO', 'montana': 'MT', 'nebraska': 'NE', 'nevada': 'NV',
-        'new hampshire': 'NH', 'new jersey': 'NJ', 'new mexico': 'NM', 'new york': 'NY',
-        'north carolina': 'NC', 'north dakota': 'ND', 'ohio': 'OH', 'oklahoma': 'OK',
-        'oregon': 'OR', 'pennsylvania': 'PA', 'rhode island': 'RI', 'south carolina': 'SC',
-        'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT',
-        'vermont': 'VT', 'virginia': 'VA', 'washington': 'WA', 'west virginia': 'WV',
-        'wisconsin': 'WI', 'wyoming': 'WY'
-    }
-
-    filename_upper = filename.upper()
-
     # First, try to find state abbreviation (most common)
-    for state in states:
-        # Look for state code as separate word or with underscores/hyphens
-        pattern = rf'\b{state}\b|_{state}_|_{state}\.|-{state}-|-{state}\.'
-        if re.search(pattern, filename_upper):
-            return state
+    codes = [m.group(1) or m.group(2) for m in _STATE_RE.finditer(filename.upper())]
+    if codes:
+        return min(codes, key=_STATE_ORDER.__getitem__)
 
     # Second, try to find full state name
-    filename_lower = filename.lower()
-    for state_name, state_code in state_names.items():
-        if state_name in filename_lower:
-            return state_code
+    names = _STATE_NAME_RE.findall(filename.lower())
+    if names:
+        return STATE_NAMES[min(names, key=_STATE_NAME_ORDER.__getitem__)]
 
     return None
 
 
+@lru_cache(maxsize=1024)
 def extract_doc_type_from_filename(filename: str) -> str:
     """
     Extract document type from filename.
 
+    Results are cached: every chunk of a PDF has the same source filename.
+
     Types:
     - formulary: Drug formulary/coverage documents
     - faq: Frequently asked questions
@@ -131,14 +152,18 @@ def generate_chunk_id(
     Returns:
         Unique chunk ID string
     """
+    return f"{_source_prefix(source)}-p{page_num}-c{chunk_index}"
+
+
+@lru_cache(maxsize=1024)
+def _source_prefix(source: str) -> str:
+    """Chunk ID prefix for a source filename (cached per file)."""
     # Extract prefix from source (remove extension, clean up)
     source_prefix = source.replace('.pdf', '').replace('.PDF', '')
     # Simplify long names
     source_prefix = source_prefix[:20]  # Limit to 20 chars
     # Remove special characters
-    source_prefix = re.sub(r'[^a-zA-Z0-9-_]', '-', source_prefix)
-
-    return f"{source_prefix}-p{page_num}-c{chunk_index}"
+    return re.sub(r'[^a-zA-Z0-9-_]', '-', source_prefix)
 
 
 def add_metadata_to_chunk(
@@ -262,28 +287,14 @@ def get_metadata_summary(chunks: List[Dict]) -> Dict:
     Returns:
         Summary dictionary with counts and distributions
     """
-    states = {}
-    doc_types = {}
-    pages = set()
-
-    for chunk in chunks:
-        # Count states
-        state = chunk.get('state', 'unknown')
-        states[state] = states.get(state, 0) + 1
-
-        # Count doc types
-        doc_type = chunk.get('doc_type', 'unknown')
-        doc_types[doc_type] = doc_types.get(doc_type, 0) + 1
-
-        # Track pages
-        page_num = chunk.get('page_num')
-        if page_num:
-            pages.add(page_num)
+    states = Counter(chunk.get('state', 'unknown') for chunk in chunks)
+    doc_types = Counter(chunk.get('doc_type', 'unknown') for chunk in chunks)
+    pages = {chunk.get('page_num') for chunk in chunks} - {None, 0}
 
     return {
         'total_chunks': len(chunks),
-        'states': states,
-        'doc_types': doc_types,
+        'states': dict(states),
+        'doc_types': dict(doc_types),
         'unique_pages': len(pages),
         'page_range': f"{min(pages)}-{max(pages)}" if pages else "N/A"
     }
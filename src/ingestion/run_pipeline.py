@@ -10,6 +10,9 @@ Runs the complete data ingestion pipeline:
 6. Build FAISS index
 7. Save to disk
 
+Steps 1-3 run file by file in worker processes, so files move through
+parse -> clean -> chunk in parallel and only their chunks come back.
+
 Usage:
     python src/ingestion/run_pipeline.py
 """
@@ -17,18 +20,27 @@ Usage:
 import os
 import sys
 import yaml
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional, Tuple
+
+# libyaml's C loader when PyYAML was built with it (same safe subset of
+# YAML as yaml.safe_load(), parsed in C)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from ingestion.pdf_parser import parse_pdf, get_pdf_info
+from ingestion.pdf_parser import get_pdf_info, parse_pdf
 from ingestion.text_cleaner import clean_pages
 from ingestion.chunker import chunk_pages, get_chunk_stats
 from ingestion.metadata_tagger import tag_chunks, get_metadata_summary
 from ingestion.embedder import Embedder
-from ingestion.faiss_indexer import build_index_from_chunks, save_index
+from ingestion.faiss_indexer import build_index_from_chunks, save_index, should_use_gpu
 
 
 def load_config(config_path: str = "config/config.yaml") -> Dict:
@@ -45,12 +57,116 @@ def load_config(config_path: str = "config/config.yaml") -> Dict:
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
 
     print(f"Loaded configuration from: {config_path}")
     return config
 
 
+@dataclass(frozen=True)
+class PipelineConfig:
+    """
+    Settings the ingestion pipeline reads from config.yaml, resolved once.
+
+    Each value is looked up (with its default) in one place, from_dict(),
+    instead of through nested config.get() calls spread over the pipeline.
+    Frozen, so the settings can't change partway through a run.
+
+    Attributes:
+        raw_data: Directory with the input PDFs (paths.raw_data)
+        processed_data: Output directory (paths.processed_data)
+        faiss_index_path: FAISS index file (paths.faiss_index)
+        metadata_path: Metadata file (paths.metadata)
+        parser: PDF parser (pdf.parser)
+        pdf_workers: Processes for parsing/cleaning/chunking (pdf.workers)
+        clean_cache_dir: Cleaned text cache directory (pdf.cache_dir)
+        chunk_size: Characters per chunk (chunking.chunk_size)
+        chunk_overlap: Overlap between chunks (chunking.chunk_overlap)
+        sentence_splitter: Sentence splitter (chunking.sentence_splitter)
+        model_name: Embedding model (embedding.model_name)
+        dimension: Embedding dimension (embedding.dimension)
+        quantize: Embedding precision (embedding.quantize)
+        backend: Embedding backend (embedding.backend)
+        device: Embedding device (embedding.device)
+        embedding_cache_dir: Embedding cache directory (embedding.cache_dir)
+        normalize: Store unit-length vectors (embedding.normalize)
+        index_type: FAISS index type (index.type)
+        metric: FAISS metric (index.metric)
+        nlist: IVF clusters, None to size from the corpus (index.nlist)
+        pq_m: PQ sub-quantizers (index.pq_m)
+        pq_nbits: Bits per PQ code, None for the index type's default
+            (index.pq_nbits)
+        index_device: Device to build the index on (index.device)
+    """
+    raw_data: str
+    processed_data: str
+    faiss_index_path: str = "data/processed/index.faiss"
+    metadata_path: str = "data/processed/metadata.parquet"
+    parser: str = "pymupdf"
+    pdf_workers: Optional[int] = None
+    clean_cache_dir: Optional[str] = None
+    chunk_size: int = 500
+    chunk_overlap: int = 50
+    sentence_splitter: str = "simple"
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    dimension: int = 384
+    quantize: str = "fp32"
+    backend: str = "torch"
+    device: str = "auto"
+    embedding_cache_dir: Optional[str] = None
+    normalize: bool = True
+    index_type: str = "flat"
+    metric: str = "ip"
+    nlist: Optional[int] = None
+    pq_m: int = 48
+    pq_nbits: Optional[int] = None
+    index_device: str = "auto"
+
+    @classmethod
+    def from_dict(cls, config: Dict) -> "PipelineConfig":
+        """
+        Resolve pipeline settings from a load_config() dictionary.
+
+        Args:
+            config: Configuration dictionary (paths.raw_data and
+                paths.processed_data are required)
+
+        Returns:
+            PipelineConfig with defaults for anything not set
+        """
+        paths = config['paths']
+        pdf = config.get('pdf') or {}
+        chunking = config.get('chunking') or {}
+        embedding = config.get('embedding') or {}
+        index = config.get('index') or {}
+
+        return cls(
+            raw_data=paths['raw_data'],
+            processed_data=paths['processed_data'],
+            faiss_index_path=paths.get('faiss_index', cls.faiss_index_path),
+            metadata_path=paths.get('metadata', cls.metadata_path),
+            parser=pdf.get('parser', cls.parser),
+            pdf_workers=pdf.get('workers'),
+            clean_cache_dir=pdf.get('cache_dir'),
+            chunk_size=chunking.get('chunk_size', cls.chunk_size),
+            chunk_overlap=chunking.get('chunk_overlap', cls.chunk_overlap),
+            sentence_splitter=chunking.get('sentence_splitter', cls.sentence_splitter),
+            model_name=embedding.get('model_name', cls.model_name),
+            dimension=embedding.get('dimension', cls.dimension),
+            quantize=embedding.get('quantize', cls.quantize),
+            backend=embedding.get('backend', cls.backend),
+            device=embedding.get('device', cls.device),
+            embedding_cache_dir=embedding.get('cache_dir'),
+            normalize=embedding.get('normalize', cls.normalize),
+            index_type=index.get('type', cls.index_type),
+            metric=index.get('metric', cls.metric),
+            nlist=index.get('nlist'),
+            pq_m=index.get('pq_m', cls.pq_m),
+            pq_nbits=index.get('pq_nbits'),
+            index_device=index.get('device', cls.index_device)
+        )
+
+
 def find_pdf_files(directory: str) -> List[str]:
     """
     Find all PDF files in a directory.
@@ -65,11 +181,7 @@ def find_pdf_files(directory: str) -> List[str]:
         raise FileNotFoundError(f"Directory not found: {directory}")
 
     pdf_files = []
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.lower().endswith('.pdf'):
-                pdf_path = os.path.join(root, file)
-                pdf_files.append(pdf_path)
+    _scan_pdf_files(directory, pdf_files)
 
     print(f"\nFound {len(pdf_files)} PDF files in {directory}")
     for pdf in pdf_files:
@@ -78,6 +190,126 @@ def find_pdf_files(directory: str) -> List[str]:
     return pdf_files
 
 
+def _scan_pdf_files(directory: str, pdf_files: List[str]) -> None:
+    """
+    Append PDF paths under directory to pdf_files, in os.walk() order.
+
+    os.scandir() entries carry the file type from the directory listing,
+    so unlike os.walk() no per-entry stat() is needed on most platforms.
+    Like os.walk(), symlinked directories are not followed and unreadable
+    subdirectories are skipped.
+    """
+    subdirs = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name.lower().endswith('.pdf'):
+                    pdf_files.append(entry.path)
+    except OSError:
+        return
+
+    # Files of a directory come before those of its subdirectories
+    for subdir in subdirs:
+        _scan_pdf_files(subdir, pdf_files)
+
+
+def _process_pdf_file(
+    pdf_path: str,
+    parser: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    sentence_splitter: str,
+    cache_dir: Optional[str] = None,
+    workers: Optional[int] = 1
+) -> Tuple[Dict, int, int, List[Dict]]:
+    """
+    Parse, clean and chunk one PDF file.
+
+    Args:
+        pdf_path: Path to the PDF file
+        parser: Parser to use (see pdf_parser.parse_pdf())
+        chunk_size: Characters per chunk
+        chunk_overlap: Overlap between chunks
+        sentence_splitter: Sentence splitter (see chunker.chunk_pages())
+        cache_dir: Cleaned text cache directory (see text_cleaner.clean_pages())
+        workers: Processes for each step's page pool (1 when this already
+            runs in a per-file worker, so pools are not nested)
+
+    Returns:
+        (info, pages extracted, pages left after cleaning, chunks)
+    """
+    pages = parse_pdf(pdf_path, parser=parser, workers=workers)
+    cleaned_pages = clean_pages(pages, workers=workers, cache_dir=cache_dir)
+    chunks = chunk_pages(
+        cleaned_pages,
+        chunk_size=chunk_size,
+        overlap=chunk_overlap,
+        smart=True,
+        splitter=sentence_splitter,
+        workers=workers
+    )
+    return get_pdf_info(pdf_path), len(pages), len(cleaned_pages), chunks
+
+
+def process_pdfs_iter(
+    pdf_paths: List[str],
+    parser: str = "pymupdf",
+    chunk_size: int = 500,
+    chunk_overlap: int = 50,
+    sentence_splitter: str = "simple",
+    cache_dir: Optional[str] = None,
+    workers: Optional[int] = None
+) -> Iterator[Tuple[Dict, int, int, List[Dict]]]:
+    """
+    Parse, clean and chunk PDF files in parallel, yielding each file in order.
+
+    Each worker process takes a file through all three steps, so one file
+    is being cleaned or chunked while others are still parsing, and only
+    the chunks (not the raw and cleaned pages) are sent back. Results are
+    yielded as soon as a file and the files before it are done, so the
+    caller can use them while later files are still in progress. A single
+    file (or workers=1) is processed in this process instead, where each
+    step is given the same workers to spread a large PDF's pages across.
+
+    Args:
+        pdf_paths: Paths to the PDF files
+        parser: Parser to use (see pdf_parser.parse_pdf())
+        chunk_size: Characters per chunk
+        chunk_overlap: Overlap between chunks
+        sentence_splitter: Sentence splitter (see chunker.chunk_pages())
+        cache_dir: Directory for the cleaned text cache (None disables; see
+            text_cleaner.clean_pages())
+        workers: Number of worker processes (default: os.cpu_count(),
+            capped at the number of files)
+
+    Yields:
+        One (info, pages extracted, pages left after cleaning, chunks)
+        tuple per file, in the order of pdf_paths
+
+    Example:
+        >>> for info, num_pages, _, chunks in process_pdfs_iter(["a.pdf"]):
+        ...     print(info["filename"], num_pages, len(chunks))
+    """
+    settings = (parser, chunk_size, chunk_overlap, sentence_splitter, cache_dir)
+
+    file_workers = min(workers or os.cpu_count() or 1, len(pdf_paths))
+    if file_workers <= 1:
+        for path in pdf_paths:
+            yield _process_pdf_file(path, *settings, workers=workers)
+        return
+
+    with ProcessPoolExecutor(max_workers=file_workers) as pool:
+        # map() submits every file up front and yields in submission order
+        yield from pool.map(
+            _process_pdf_file,
+            pdf_paths,
+            *[[setting] * len(pdf_paths) for setting in settings]
+        )
+
+
 def run_ingestion_pipeline(
     config_path: str = "config/config.yaml",
     pdf_dir: str = None,
@@ -97,13 +329,13 @@ def run_ingestion_pipeline(
 
     # Load configuration
     print("\n[1/7] Loading configuration...")
-    config = load_config(config_path)
+    config = PipelineConfig.from_dict(load_config(config_path))
 
     # Get directories
     if pdf_dir is None:
-        pdf_dir = config['paths']['raw_data']
+        pdf_dir = config.raw_data
     if output_dir is None:
-        output_dir = config['paths']['processed_data']
+        output_dir = config.processed_data
 
     print(f"  Input directory: {pdf_dir}")
     print(f"  Output directory: {output_dir}")
@@ -116,43 +348,37 @@ def run_ingestion_pipeline(
         print("\nNo PDF files found. Exiting.")
         return
 
-    # Parse PDFs
-    print("\n[3/7] Parsing PDFs...")
-    all_pages = []
-
-    for pdf_path in pdf_files:
-        print(f"\n  Processing: {os.path.basename(pdf_path)}")
-
-        # Get info
-        info = get_pdf_info(pdf_path)
+    # Parse, clean and chunk PDFs
+    # Each file goes through parse -> clean -> chunk in a worker process,
+    # so the three steps overlap across files. Chunks come back in file
+    # order as files finish; only chunks are held, never the corpus pages.
+    print("\n[3/7] Parsing, cleaning and chunking PDFs...")
+    chunks = []
+    total_pages = 0
+    total_cleaned = 0
+
+    processed = process_pdfs_iter(
+        pdf_files,
+        parser=config.parser,
+        chunk_size=config.chunk_size,
+        chunk_overlap=config.chunk_overlap,
+        sentence_splitter=config.sentence_splitter,
+        cache_dir=config.clean_cache_dir,
+        workers=config.pdf_workers
+    )
+    for pdf_path, (info, num_pages, num_cleaned, file_chunks) in zip(pdf_files, processed):
+        print(f"\n  Processed: {os.path.basename(pdf_path)}")
         print(f"    Pages: {info['num_pages']}, Size: {info['file_size_mb']} MB")
+        print(f"    Extracted: {num_pages} pages")
+        print(f"    Cleaned: {num_cleaned} pages")
+        print(f"    Chunks: {len(file_chunks)}")
 
-        # Parse
-        parser = config.get('pdf', {}).get('parser', 'pdfplumber')
-        pages = parse_pdf(pdf_path, parser=parser)
-        print(f"    Extracted: {len(pages)} pages")
-
-        all_pages.extend(pages)
-
-    print(f"\n  Total pages extracted: {len(all_pages)}")
-
-    # Clean text
-    print("\n[4/7] Cleaning text...")
-    cleaned_pages = clean_pages(all_pages)
-    print(f"  Cleaned: {len(cleaned_pages)} pages")
+        total_pages += num_pages
+        total_cleaned += num_cleaned
+        chunks.extend(file_chunks)
 
-    # Chunk text
-    print("\n[5/7] Chunking text...")
-    chunking_config = config.get('chunking', {})
-    chunk_size = chunking_config.get('chunk_size', 500)
-    chunk_overlap = chunking_config.get('chunk_overlap', 50)
-
-    chunks = chunk_pages(
-        cleaned_pages,
-        chunk_size=chunk_size,
-        overlap=chunk_overlap,
-        smart=True
-    )
+    print(f"\n  Total pages extracted: {total_pages}")
+    print(f"  Cleaned: {total_cleaned} pages")
 
     stats = get_chunk_stats(chunks)
     print(f"  Total chunks: {stats['total_chunks']}")
@@ -160,7 +386,7 @@ def run_ingestion_pipeline(
     print(f"  Size range: [{stats['min_chunk_size']}, {stats['max_chunk_size']}]")
 
     # Tag metadata
-    print("\n[6/7] Tagging metadata...")
+    print("\n[4/7] Tagging metadata...")
     tagged_chunks = tag_chunks(chunks)
 
     summary = get_metadata_summary(tagged_chunks)
@@ -169,29 +395,47 @@ def run_ingestion_pipeline(
     print(f"  Unique pages: {summary['unique_pages']}")
 
     # Generate embeddings
-    print("\n[7/7] Generating embeddings...")
-    embedding_config = config.get('embedding', {})
-    model_name = embedding_config.get('model_name', 'sentence-transformers/all-MiniLM-L6-v2')
-
-    embedder = Embedder(model_name=model_name)
+    print("\n[5/7] Generating embeddings...")
+    embedder = Embedder(
+        model_name=config.model_name,
+        quantize=config.quantize,
+        backend=config.backend,
+        device=config.device,
+        cache_dir=config.embedding_cache_dir,
+        normalize=config.normalize
+    )
 
-    embedded_chunks = embedder.embed_chunks(
+    # Batch size defaults to 32 on CPU and 256 on GPU. Embeddings stay in
+    # one matrix (ChunkStore) rather than one array per chunk dict.
+    chunk_store = embedder.embed_store(
         tagged_chunks,
-        batch_size=32,
         show_progress=True
     )
 
     # Build FAISS index
-    print("\n[8/7] Building FAISS index...")
-    dimension = embedding_config.get('dimension', 384)
-    index, metadata = build_index_from_chunks(embedded_chunks, dimension=dimension)
+    print("\n[6/7] Building FAISS index...")
+
+    # Training and adds run on the GPU when there is one; save_index()
+    # copies the index back to CPU before writing it
+    use_gpu = should_use_gpu(config.index_device)
+
+    index, metadata = build_index_from_chunks(
+        chunk_store,
+        dimension=config.dimension,
+        index_type=config.index_type,
+        use_gpu=use_gpu,
+        metric=config.metric,
+        nlist=config.nlist,
+        m=config.pq_m,
+        nbits=config.pq_nbits
+    )
 
     # Save index
-    print("\n[9/7] Saving to disk...")
+    print("\n[7/7] Saving to disk...")
     os.makedirs(output_dir, exist_ok=True)
 
-    index_path = config['paths'].get('faiss_index', 'data/processed/index.faiss')
-    metadata_path = config['paths'].get('metadata', 'data/processed/metadata.json')
+    index_path = config.faiss_index_path
+    metadata_path = config.metadata_path
 
     # Extract directory and filenames from paths
     index_dir = os.path.dirname(index_path)
@@ -206,9 +450,9 @@ def run_ingestion_pipeline(
     print("=" * 70)
     print(f"\nProcessed:")
     print(f"  - {len(pdf_files)} PDF files")
-    print(f"  - {len(all_pages)} pages")
+    print(f"  - {total_pages} pages")
     print(f"  - {len(chunks)} chunks")
-    print(f"  - {len(embedded_chunks)} embeddings")
+    print(f"  - {len(chunk_store)} embeddings")
     print(f"\nOutput:")
     print(f"  - Index: {index_path}")
     print(f"  - Metadata: {metadata_path}")
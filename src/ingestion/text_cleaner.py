@@ -11,8 +11,92 @@ Handles common PDF extraction issues:
 - Headers and footers
 """
 
+import os
 import re
-from typing import List
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional
+
+try:
+    from .cache import ContentCache
+except ImportError:  # Run as a script: python src/ingestion/text_cleaner.py
+    from cache import ContentCache
+
+# clean_pages() only fans out to worker processes above this many pages;
+# below it, process start-up and pickling cost more than the cleaning
+PARALLEL_MIN_PAGES = 32
+
+# File name of the clean_pages(cache_dir=...) cache inside cache_dir
+CLEAN_CACHE_FILE = "cleaned_text.sqlite"
+
+# Patterns are compiled once at import instead of on every call
+# (re.sub/re.search with a string pattern pay a cache lookup per call)
+
+# remove_extra_spaces(): a run of 3+ single characters separated by
+# whitespace ("M e t f o r m i n"). Same matches as (?:\b\w\s+){2,}\w\b:
+# inside a run every character follows whitespace, so only the two ends
+# need a word-boundary test, done as one-sided lookarounds (about 2x
+# faster than \b on every repetition). \w and \s never overlap, so
+# backtracking stays linear without possessive quantifiers.
+_RE_SPACED_RUN = re.compile(r'(?<!\w)\w\s+(?:\w\s+)+\w(?!\w)')
+# Only runs of 2+ spaces: single spaces (almost all of them) are already
+# right, and the literal '  ' prefix lets the engine skip straight to
+# candidates, so clean text costs one fast scan and no rewrites
+_RE_MULTI_SPACE = re.compile(r'  +')
+
+# fix_encoding_issues() replacements, applied in this order. Mojibake
+# (UTF-8 text mis-decoded as Windows-1252) goes first: the single
+# characters below could otherwise complete a new sequence ('\u201d' -> '"')
+_MOJIBAKE_REPLACEMENTS = (
+    ('â€"', '--'),     # Em dash
+    ('â€™', "'"),      # Apostrophe
+    ('â€œ', '"'),      # Left quote
+    ('â€\x9d', '"'),   # Right quote
+    ('â€¢', '•'),      # Bullet
+)
+_CHAR_REPLACEMENTS = (
+    ('Â', ''),          # Non-breaking space artifact
+    ('\u2013', '-'),    # En dash
+    ('\u2014', '--'),   # Em dash
+    ('\u2018', "'"),    # Left single quote
+    ('\u2019', "'"),    # Right single quote
+    ('\u201c', '"'),    # Left double quote
+    ('\u201d', '"'),    # Right double quote
+    ('\u2022', '•'),    # Bullet point
+)
+
+# Default remove_common_headers_footers() patterns
+DEFAULT_HEADER_FOOTER_PATTERNS = (
+    r'\| Page \d+ \|',              # "| Page 23 |"
+    r'Page \d+',                    # "Page 23"
+    r'Oscar Health Insurance',      # Company name
+    r'Confidential',                # Common footer
+    r'\d{1,2}/\d{1,2}/\d{4}',      # Dates like "11/18/2024"
+)
+
+# remove_page_numbers(): "Page X", "X of Y", a number alone on a line
+_RE_PAGE = re.compile(r'\bPage\s+\d+\b', re.IGNORECASE)
+_RE_X_OF_Y = re.compile(r'\b\d+\s+of\s+\d+\b')
+_RE_LINE_NUM = re.compile(r'^\d+$', re.MULTILINE)
+
+# clean_text(): the default headers/footers and the page-number patterns
+# above fused into one alternation, so both removals take a single scan.
+# Matches only exposed by an earlier removal are not caught (the separate
+# functions would remove "3" + "Page 7" in two passes).
+# Scoped flags keep each pattern's own case/line handling. The leading
+# lookahead lists every character a match can start with ('|', p, o, c or
+# a digit; keep it in sync with the patterns): positions starting with
+# anything else are rejected there instead of trying each alternative.
+_RE_HEADERS_AND_PAGE_NUMBERS = re.compile(
+    r'(?=[|pPoOcC\d])(?:'
+    + '|'.join(f'(?:{p})' for p in DEFAULT_HEADER_FOOTER_PATTERNS)
+    + r'|\bPage\s+\d+\b'
+    + r'|(?-i:\b\d+\s+of\s+\d+\b)'
+    + r'|(?m:^\d+$)'
+    + ')',
+    re.IGNORECASE
+)
 
 
 def remove_extra_spaces(text: str) -> str:
@@ -32,16 +116,21 @@ def remove_extra_spaces(text: str) -> str:
     """
     # First, handle spaced-out words (single letters with spaces)
     # "M e t f o r m i n" -> "Metformin"
-    # Pattern: letter + space + letter (repeated)
-    while re.search(r'\b(\w\s+){2,}\w\b', text):
-        text = re.sub(r'\b((\w)\s+(?=\w))', r'\2', text)
+    # Pattern: letter + space + letter (repeated). Each run is joined in
+    # one scan; other single-letter words ("a", "I") are left alone
+    text = _RE_SPACED_RUN.sub(_join_run, text)
 
     # Replace multiple spaces with single space
-    text = re.sub(r' +', ' ', text)
+    text = _RE_MULTI_SPACE.sub(' ', text)
 
     return text
 
 
+def _join_run(match: re.Match) -> str:
+    """Drop the whitespace inside one spaced-out run ("M e t" -> "Met")."""
+    return ''.join(match.group(0).split())
+
+
 def fix_line_breaks(text: str) -> str:
     """
     Fix broken line breaks that split sentences unnaturally.
@@ -59,11 +148,10 @@ def fix_line_breaks(text: str) -> str:
     Returns:
         Text with properly joined sentences
     """
-    lines = text.split('\n')
     result_lines = []
     current_paragraph = []
 
-    for line in lines:
+    for line in text.split('\n'):
         line = line.strip()
 
         if not line:
@@ -72,18 +160,22 @@ def fix_line_breaks(text: str) -> str:
                 result_lines.append(' '.join(current_paragraph))
                 current_paragraph = []
                 result_lines.append('')  # Keep paragraph break
-            continue
-
-        # Check if line ends with sentence-ending punctuation
-        ends_with_punctuation = line.endswith(('.', '!', '?', ':'))
 
-        if ends_with_punctuation:
-            # Add to current paragraph and end the sentence
+        elif current_paragraph:
+            # Continues the current paragraph; sentence-ending punctuation
+            # ends it
             current_paragraph.append(line)
-            result_lines.append(' '.join(current_paragraph))
-            current_paragraph = []
+            if line[-1] in '.!?:':
+                result_lines.append(' '.join(current_paragraph))
+                current_paragraph = []
+
+        elif line[-1] in '.!?:':
+            # A complete line on its own (the common case): emitted as is,
+            # without building and joining a one-item paragraph
+            result_lines.append(line)
+
         else:
-            # Add to current paragraph (will be joined)
+            # Start a paragraph (later lines will be joined to it)
             current_paragraph.append(line)
 
     # Don't forget last paragraph if exists
@@ -91,9 +183,7 @@ def fix_line_breaks(text: str) -> str:
         result_lines.append(' '.join(current_paragraph))
 
     # Join with newlines
-    result = '\n'.join(result_lines)
-
-    return result
+    return '\n'.join(result_lines)
 
 
 def normalize_whitespace(text: str) -> str:
@@ -112,29 +202,34 @@ def normalize_whitespace(text: str) -> str:
         Text with normalized whitespace
     """
     # Replace tabs with spaces
-    text = text.replace('\t', ' ')
+    if '\t' in text:
+        text = text.replace('\t', ' ')
 
     # Replace carriage returns
-    text = text.replace('\r\n', '\n')
-    text = text.replace('\r', '\n')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n')
+        text = text.replace('\r', '\n')
 
     # Remove spaces at start and end of each line
-    lines = [line.strip() for line in text.split('\n')]
-
-    # Remove empty lines, but keep one blank line for paragraphs
-    cleaned_lines = []
-    prev_empty = False
+    text = '\n'.join([line.strip() for line in text.split('\n')])
+
+    # Collapse runs of empty lines, but keep one blank line for paragraphs.
+    # Each replace() pass shrinks a run by about a third, all in C, instead
+    # of a Python loop over every line.
+    if '\n\n' in text:
+        while '\n\n\n' in text:
+            text = text.replace('\n\n\n', '\n\n')
+        # A blank run at either end is a single newline (one empty line)
+        if text.startswith('\n\n'):
+            text = text[1:]
+        if text.endswith('\n\n'):
+            text = text[:-1]
+
+    # Whitespace only
+    if text == '\n':
+        return ''
 
-    for line in lines:
-        if line:
-            cleaned_lines.append(line)
-            prev_empty = False
-        elif not prev_empty:
-            # Keep one blank line for paragraph separation
-            cleaned_lines.append('')
-            prev_empty = True
-
-    return '\n'.join(cleaned_lines)
+    return text
 
 
 def fix_encoding_issues(text: str) -> str:
@@ -152,26 +247,20 @@ def fix_encoding_issues(text: str) -> str:
     Returns:
         Text with fixed encoding
     """
-    # Common replacements
-    replacements = {
-        'â€"': '-',      # Em dash
-        'â€"': '--',     # Double dash
-        'â€™': "'",      # Apostrophe
-        'â€œ': '"',      # Left quote
-        'â€\x9d': '"',   # Right quote
-        'â€¢': '•',      # Bullet
-        'Â': '',         # Non-breaking space artifact
-        '\u2013': '-',   # En dash
-        '\u2014': '--',  # Em dash
-        '\u2018': "'",   # Left single quote
-        '\u2019': "'",   # Right single quote
-        '\u201c': '"',   # Left double quote
-        '\u201d': '"',   # Right double quote
-        '\u2022': '•',   # Bullet point
-    }
-
-    for old, new in replacements.items():
-        text = text.replace(old, new)
+    # Pure-ASCII text (most pages) has nothing to fix
+    if text.isascii():
+        return text
+
+    # All mojibake starts with 'â€', so one search rules it all out
+    if 'â€' in text:
+        for old, new in _MOJIBAKE_REPLACEMENTS:
+            text = text.replace(old, new)
+
+    # A containment check is a fast scan; replace() only runs (and only
+    # allocates a new string) for characters that actually occur
+    for old, new in _CHAR_REPLACEMENTS:
+        if old in text:
+            text = text.replace(old, new)
 
     return text
 
@@ -187,25 +276,24 @@ def remove_common_headers_footers(text: str, patterns: List[str] = None) -> str:
 
     Args:
         text: Input text with potential headers/footers
-        patterns: List of regex patterns to remove (optional)
+        patterns: List of regex patterns to remove (optional, default
+            DEFAULT_HEADER_FOOTER_PATTERNS). They are combined into one
+            alternation and removed in a single pass; where two patterns
+            match at the same position, the earlier one wins.
 
     Returns:
         Text with headers/footers removed
     """
     if patterns is None:
-        # Default patterns to remove
-        patterns = [
-            r'Page \d+',                    # "Page 23"
-            r'\| Page \d+ \|',              # "| Page 23 |"
-            r'Oscar Health Insurance',      # Company name
-            r'Confidential',                # Common footer
-            r'\d{1,2}/\d{1,2}/\d{4}',      # Dates like "11/18/2024"
-        ]
-
-    for pattern in patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        patterns = DEFAULT_HEADER_FOOTER_PATTERNS
+
+    return _compile_alternation(tuple(patterns)).sub('', text)
 
-    return text
+
+@lru_cache(maxsize=32)
+def _compile_alternation(patterns: tuple) -> re.Pattern:
+    """Compile patterns into one case-insensitive alternation (cached)."""
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), re.IGNORECASE)
 
 
 def remove_page_numbers(text: str) -> str:
@@ -224,12 +312,12 @@ def remove_page_numbers(text: str) -> str:
         Text with page numbers removed
     """
     # Remove "Page X" or "X of Y"
-    text = re.sub(r'\bPage\s+\d+\b', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\b\d+\s+of\s+\d+\b', '', text)
+    text = _RE_PAGE.sub('', text)
+    text = _RE_X_OF_Y.sub('', text)
 
     # Remove standalone numbers that are likely page numbers
     # (number alone on a line at start or end)
-    text = re.sub(r'^\d+$', '', text, flags=re.MULTILINE)
+    text = _RE_LINE_NUM.sub('', text)
 
     return text
 
@@ -265,10 +353,12 @@ def clean_text(text: str, remove_headers: bool = True) -> str:
     # Step 1: Fix encoding issues first
     text = fix_encoding_issues(text)
 
-    # Step 2: Remove headers/footers (optional)
+    # Step 2: Remove headers/footers and page numbers (optional). One scan
+    # of the patterns used by remove_common_headers_footers() and
+    # remove_page_numbers(); unlike running those two in turn, text a
+    # removal brings together is not re-scanned ("3Page 7" -> "3", not "")
     if remove_headers:
-        text = remove_common_headers_footers(text)
-        text = remove_page_numbers(text)
+        text = _RE_HEADERS_AND_PAGE_NUMBERS.sub('', text)
 
     # Step 3: Fix line breaks
     text = fix_line_breaks(text)
@@ -285,13 +375,30 @@ def clean_text(text: str, remove_headers: bool = True) -> str:
     return text
 
 
-def clean_pages(pages: List[dict]) -> List[dict]:
+def clean_pages(
+    pages: List[dict],
+    workers: Optional[int] = 1,
+    cache_dir: Optional[str] = None
+) -> List[dict]:
     """
     Clean text from multiple pages (from PDF parser output).
 
+    clean_text() is pure-Python regex work that holds the GIL, so with
+    workers > 1 (or None) and more than PARALLEL_MIN_PAGES pages the
+    texts are cleaned in a process pool. Page order and metadata are the
+    same as sequential cleaning.
+
+    With cache_dir, cleaned texts are kept in an on-disk cache keyed by a
+    hash of the page text (and of this module's source, so editing the
+    cleaner invalidates old entries). Re-running on unchanged PDFs then
+    only cleans new or edited pages.
+
     Args:
         pages: List of page dictionaries from pdf_parser.parse_pdf()
                Format: [{"page_num": 1, "text": "...", "source": "file.pdf"}, ...]
+        workers: Number of worker processes (default: 1, clean in this
+                 process; None for os.cpu_count())
+        cache_dir: Directory for the cleaned text cache (None disables)
 
     Returns:
         List of page dictionaries with cleaned text
@@ -299,18 +406,91 @@ def clean_pages(pages: List[dict]) -> List[dict]:
     Example:
         >>> pages = parse_pdf("document.pdf")
         >>> cleaned_pages = clean_pages(pages)
+        >>> cleaned_pages = clean_pages(pages, cache_dir="data/cache")
     """
-    cleaned = []
+    workers = workers or os.cpu_count() or 1
+
+    if cache_dir is None and (workers <= 1 or len(pages) <= PARALLEL_MIN_PAGES):
+        return list(clean_pages_iter(pages))
+
+    texts = [page['text'] for page in pages]
+    if cache_dir is not None:
+        cleaned_texts = _clean_texts_cached(texts, workers, cache_dir)
+    else:
+        cleaned_texts = _clean_texts(texts, workers)
+
+    # Only keep pages that have text after cleaning
+    return [
+        {**page, 'text': text}
+        for page, text in zip(pages, cleaned_texts)
+        if text
+    ]
+
+
+def _clean_texts(texts: List[str], workers: int) -> List[str]:
+    """clean_text() of each text, in a process pool above PARALLEL_MIN_PAGES."""
+    if workers <= 1 or len(texts) <= PARALLEL_MIN_PAGES:
+        return [clean_text(text) for text in texts]
+
+    # Several pages per task amortizes the cost of pickling to the workers
+    batch = max(1, len(texts) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(clean_text, texts, chunksize=batch))
+
+
+def _clean_texts_cached(texts: List[str], workers: int, cache_dir: str) -> List[str]:
+    """Clean only texts missing from the cache, then store their results."""
+    cache = ContentCache(os.path.join(cache_dir, CLEAN_CACHE_FILE))
+    try:
+        namespace = _clean_cache_namespace()
+        keys = [ContentCache.make_key(namespace, text) for text in texts]
+        hits = cache.get_many(list(set(keys)))
+
+        # Repeated texts (e.g. identical boilerplate pages) are cleaned once
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key not in hits:
+                misses.setdefault(key, text)
+
+        if misses:
+            cleaned = _clean_texts(list(misses.values()), workers)
+            computed = dict(zip(misses, (text.encode('utf-8') for text in cleaned)))
+            cache.put_many(computed.items())
+            hits.update(computed)
+    finally:
+        cache.close()
+
+    return [hits[key].decode('utf-8') for key in keys]
+
+
+@lru_cache(maxsize=1)
+def _clean_cache_namespace() -> str:
+    """Cache namespace: changes whenever this module's source does."""
+    with open(__file__, 'rb') as f:
+        source_digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    return f"clean_text|{source_digest}"
+
+
+def clean_pages_iter(pages: Iterable[dict]) -> Iterator[dict]:
+    """
+    Lazily clean pages, yielding one cleaned page dictionary at a time.
+
+    Same pages as clean_pages(), but nothing is materialized: pages can
+    come from a generator and be passed on (e.g. to chunker.iter_chunks())
+    as they are cleaned.
+
+    Args:
+        pages: Iterable of page dictionaries
 
+    Yields:
+        Page dictionaries with cleaned text (pages left empty are skipped)
+    """
     for page in pages:
-        cleaned_page = page.copy()
-        cleaned_page['text'] = clean_text(page['text'])
+        text = clean_text(page['text'])
 
         # Only keep pages that have text after cleaning
-        if cleaned_page['text']:
-            cleaned.append(cleaned_page)
-
-    return cleaned
+        if text:
+            yield {**page, 'text': text}
 
 
 if __name__ == "__main__":
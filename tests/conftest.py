@@ -0,0 +1,44 @@
+"""
+Shared pytest setup.
+
+Makes the src/ packages importable (e.g. `from ingestion import chunker`)
+without installing the project, and provides sample parsed PDF pages.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Words and separators used to build the sample pages
+_WORDS = ["enrollment", "plan", "deductible", "coverage", "Dr.", "premium", "3.5", "HMO"]
+_ENDINGS = [". ", "! ", "? ", ": ", " ", " ", "\n", "  ", ".\n\n"]
+
+
+def _make_pages(num_pages: int, seed: int = 0, source: str = "sample.pdf"):
+    """
+    Build parser-style pages ({"page_num", "text", "source"}) with
+    sentences, page numbers, headers, extra spaces and some empty pages.
+    """
+    rng = random.Random(seed)
+    pages = []
+    for page_num in range(1, num_pages + 1):
+        if page_num % 7 == 0:
+            text = "   \n  "
+        else:
+            body = "".join(
+                rng.choice(_WORDS) + rng.choice(_ENDINGS)
+                for _ in range(rng.randint(20, 300))
+            )
+            text = f"Confidential\nPage {page_num}\n{body}\nP l a n  d e t a i l s\n{page_num}"
+        pages.append({"page_num": page_num, "text": text, "source": source})
+    return pages
+
+
+@pytest.fixture
+def sample_pages():
+    """Enough pages to go past every PARALLEL_MIN_PAGES threshold."""
+    return _make_pages(60)
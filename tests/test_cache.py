@@ -0,0 +1,90 @@
+"""Tests for ingestion.cache.ContentCache and the cleaned text cache built on it."""
+
+import os
+
+import pytest
+
+from ingestion import text_cleaner
+from ingestion.cache import ContentCache
+from ingestion.text_cleaner import clean_pages
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ContentCache(str(tmp_path / "sub" / "cache.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_make_key_depends_on_namespace_and_text():
+    key = ContentCache.make_key("model-a", "text")
+    assert key == ContentCache.make_key("model-a", "text")
+    assert len(key) == 16
+    assert key != ContentCache.make_key("model-b", "text")
+    assert key != ContentCache.make_key("model-a", "text ")
+
+
+def test_get_many_returns_only_hits(cache):
+    hit, miss = ContentCache.make_key("ns", "hit"), ContentCache.make_key("ns", "miss")
+    cache.put_many([(hit, b"value")])
+
+    assert cache.get_many([hit, miss]) == {hit: b"value"}
+    assert cache.get_many([miss]) == {}
+
+
+def test_get_many_above_parameter_limit(cache):
+    items = [(ContentCache.make_key("ns", str(i)), str(i).encode()) for i in range(1200)]
+    cache.put_many(items)
+    assert cache.get_many([key for key, _ in items]) == dict(items)
+
+
+def test_values_persist_across_opens(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    key = ContentCache.make_key("ns", "text")
+
+    cache = ContentCache(path)
+    cache.put_many([(key, b"first")])
+    cache.close()
+
+    cache = ContentCache(path)
+    cache.put_many([(key, b"second")])
+    assert cache.get_many([key]) == {key: b"second"}
+    cache.close()
+
+
+def test_clean_pages_cache_hit_matches_miss(sample_pages, tmp_path):
+    cache_dir = str(tmp_path)
+    expected = clean_pages(sample_pages)
+
+    cold = clean_pages(sample_pages, cache_dir=cache_dir)
+    assert os.path.exists(os.path.join(cache_dir, text_cleaner.CLEAN_CACHE_FILE))
+    warm = clean_pages(sample_pages, cache_dir=cache_dir)
+
+    assert cold == expected
+    assert warm == expected
+
+
+def test_clean_pages_cache_only_cleans_misses(sample_pages, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path)
+    clean_pages(sample_pages, cache_dir=cache_dir)
+
+    edited = [dict(page) for page in sample_pages]
+    edited[0]["text"] += "\nA new sentence."
+    expected = clean_pages(edited)
+
+    cleaned_texts = []
+    real_clean_text = text_cleaner.clean_text
+
+    def counting_clean_text(text, *args, **kwargs):
+        cleaned_texts.append(text)
+        return real_clean_text(text, *args, **kwargs)
+
+    monkeypatch.setattr(text_cleaner, "clean_text", counting_clean_text)
+    assert clean_pages(edited, cache_dir=cache_dir) == expected
+    assert cleaned_texts == [edited[0]["text"]]
+
+
+def test_clean_pages_cache_with_workers(sample_pages, tmp_path):
+    expected = clean_pages(sample_pages)
+    assert clean_pages(sample_pages, workers=2, cache_dir=str(tmp_path)) == expected
+    assert clean_pages(sample_pages, workers=2, cache_dir=str(tmp_path)) == expected
@@ -0,0 +1,68 @@
+"""Tests for ingestion.chunker: parallel and compiled paths match the Python one."""
+
+import pytest
+
+from ingestion import chunker
+from ingestion.chunker import chunk_pages, chunk_pages_batch, iter_chunks
+from ingestion.text_cleaner import clean_pages
+
+CHUNK_SETTINGS = [(500, 50), (200, 30), (100, 0), (50, 80)]
+
+
+@pytest.mark.parametrize("chunk_size,overlap", CHUNK_SETTINGS)
+@pytest.mark.parametrize("smart", [True, False])
+def test_chunk_pages_parallel_matches_serial(sample_pages, chunk_size, overlap, smart):
+    pages = clean_pages(sample_pages)
+    assert len(pages) > chunker.PARALLEL_MIN_PAGES
+
+    serial = chunk_pages(pages, chunk_size, overlap, smart=smart, workers=1)
+    parallel = chunk_pages(pages, chunk_size, overlap, smart=smart, workers=2)
+
+    assert serial
+    assert parallel == serial
+
+
+def test_chunk_pages_defaults_to_serial(sample_pages, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("chunk_pages() started a process pool")
+
+    monkeypatch.setattr(chunker, "ProcessPoolExecutor", no_pool)
+    assert chunk_pages(sample_pages) == list(iter_chunks(sample_pages))
+
+
+def test_chunk_pages_batch_matches_chunk_pages(sample_pages):
+    batch = chunk_pages_batch(sample_pages, 200, 30)
+    assert batch.to_dicts() == chunk_pages(sample_pages, 200, 30)
+
+
+@pytest.fixture
+def compiled():
+    """The optional Cython kernels; skipped unless _chunker.pyx is built."""
+    return pytest.importorskip("ingestion._chunker")
+
+
+def _page_texts(pages):
+    return [page["text"] for page in clean_pages(pages)] + ["", "   ", "a", "One. Two? Three!"]
+
+
+def test_compiled_split_sentences_matches_python(compiled, sample_pages):
+    for text in _page_texts(sample_pages):
+        assert compiled.split_sentences(text) == chunker._split_sentences(text)
+
+
+@pytest.mark.parametrize("chunk_size,overlap", CHUNK_SETTINGS)
+def test_compiled_pack_sentences_matches_python(compiled, sample_pages, chunk_size, overlap):
+    for text in _page_texts(sample_pages):
+        sentences = chunker._split_sentences(text)
+        assert (compiled.pack_sentences(sentences, chunk_size, overlap)
+                == chunker._pack_sentences(sentences, chunk_size, overlap))
+
+
+@pytest.mark.parametrize("chunk_size,overlap", CHUNK_SETTINGS)
+def test_compiled_chunk_text_matches_python(compiled, sample_pages, monkeypatch, chunk_size, overlap):
+    texts = _page_texts(sample_pages)
+    expected = [compiled.chunk_text(text, chunk_size, overlap) for text in texts]
+
+    # chunk_text() dispatches to the extension when it's built
+    monkeypatch.setattr(chunker, "_chunk_text_c", None)
+    assert [chunker.chunk_text(text, chunk_size, overlap) for text in texts] == expected
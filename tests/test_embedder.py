@@ -0,0 +1,175 @@
+"""
+Tests for ingestion.embedder, run against a stub sentence-transformers model.
+
+The stub tokenizes on whitespace and mean-pools a fixed random embedding
+table, with the tokenizer/model API the Embedder uses, so no model has to
+be downloaded.
+"""
+
+import sys
+import types
+import zlib
+
+import numpy as np
+import pytest
+
+from ingestion.chunker import iter_chunks
+from ingestion.embedder import ChunkStore, Embedder
+from ingestion.faiss_indexer import build_index_from_chunks, search_index
+from ingestion.text_cleaner import clean_pages
+
+STUB_DIMENSION = 16
+STUB_VOCAB_SIZE = 1000
+PAD_ID, CLS_ID, SEP_ID = 0, 1, 2
+
+
+class StubTokenizer:
+    """Whitespace tokenizer with the __call__/pad API of a HF tokenizer."""
+
+    def __call__(self, texts, padding=False, truncation=True, max_length=None, return_tensors=None):
+        input_ids = [self._ids(text, max_length if truncation else None) for text in texts]
+        if padding:
+            return self.pad({"input_ids": input_ids}, return_tensors=return_tensors)
+        return {"input_ids": input_ids, "attention_mask": [[1] * len(ids) for ids in input_ids]}
+
+    @staticmethod
+    def _ids(text, max_length):
+        words = [3 + zlib.crc32(word.encode()) % (STUB_VOCAB_SIZE - 3) for word in text.split()]
+        ids = [CLS_ID] + words + [SEP_ID]
+        if max_length is not None and len(ids) > max_length:
+            ids = ids[:max_length - 1] + [SEP_ID]
+        return ids
+
+    def pad(self, encoded, return_tensors=None):
+        rows = encoded["input_ids"]
+        input_ids = np.full((len(rows), max(map(len, rows))), PAD_ID, dtype=np.int64)
+        attention_mask = np.zeros_like(input_ids)
+        for i, row in enumerate(rows):
+            input_ids[i, :len(row)] = row
+            attention_mask[i, :len(row)] = 1
+
+        features = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if return_tensors == "pt":
+            import torch
+            features = {k: torch.from_numpy(v) for k, v in features.items()}
+        return features
+
+
+class StubSentenceTransformer:
+    """Mean-pooled embedding table; encode() tokenizes, pads and pools like SentenceTransformer."""
+
+    max_seq_length = 24
+
+    def __init__(self, model_name, device=None):
+        self.tokenizer = StubTokenizer()
+        rng = np.random.default_rng(0)
+        self.table = rng.standard_normal((STUB_VOCAB_SIZE, STUB_DIMENSION)).astype(np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return STUB_DIMENSION
+
+    def half(self):
+        return self
+
+    def _pool(self, input_ids, attention_mask):
+        mask = attention_mask[..., None].astype(np.float32)
+        return (self.table[input_ids] * mask).sum(axis=1) / mask.sum(axis=1)
+
+    def __call__(self, features):
+        import torch
+        pooled = self._pool(features["input_ids"].numpy(), features["attention_mask"].numpy())
+        return {"sentence_embedding": torch.from_numpy(pooled)}
+
+    def encode(self, texts, batch_size=32, show_progress_bar=False,
+               convert_to_numpy=True, normalize_embeddings=False):
+        features = self.tokenizer(texts, padding=True, truncation=True, max_length=self.max_seq_length)
+        embeddings = self._pool(features["input_ids"], features["attention_mask"])
+        if normalize_embeddings:
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = StubSentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+    return Embedder("stub-model", device="cpu")
+
+
+@pytest.fixture
+def chunks(sample_pages):
+    return list(iter_chunks(clean_pages(sample_pages), chunk_size=200, overlap=30))
+
+
+def test_embed_stream_into_index(embedder, chunks, tmp_path):
+    expected = embedder.embed_texts([chunk["text"] for chunk in chunks], show_progress=False)
+
+    # batch_size=4 gives windows of 32 chunks, so several windows are written
+    embeddings, consumed = embedder.embed_stream(
+        iter(chunks), str(tmp_path / "embeddings.bin"), batch_size=4, show_progress=False
+    )
+
+    assert len(chunks) > 4 * 32
+    assert consumed == chunks
+    assert isinstance(embeddings, np.memmap) and not embeddings.flags.writeable
+    np.testing.assert_allclose(embeddings, expected, rtol=1e-6, atol=1e-6)
+
+    index, metadata = build_index_from_chunks(ChunkStore(embeddings, consumed), STUB_DIMENSION)
+
+    assert index.ntotal == len(chunks)
+    assert metadata == chunks
+    np.testing.assert_allclose(embeddings, expected, rtol=1e-6, atol=1e-6)
+    assert search_index(index, expected[5], top_k=1)[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+
+def test_embed_stream_empty(embedder, tmp_path):
+    embeddings, consumed = embedder.embed_stream(iter([]), str(tmp_path / "embeddings.bin"))
+    assert embeddings.shape == (0, STUB_DIMENSION)
+    assert consumed == []
+
+
+def test_embed_stream_rejects_wrong_dimension(embedder, chunks, tmp_path):
+    embedder.dimension = STUB_DIMENSION + 1
+    with pytest.raises(ValueError):
+        embedder.embed_stream(iter(chunks), str(tmp_path / "embeddings.bin"), show_progress=False)
+
+
+def test_pretokenized_embeddings_match_encode(embedder, chunks):
+    pytest.importorskip("torch")
+    expected = embedder.embed_texts([chunk["text"] for chunk in chunks], show_progress=False)
+
+    # embed_store() tokenizes the chunks once and embeds from their token ids
+    store = embedder.embed_store([dict(chunk) for chunk in chunks], show_progress=False)
+
+    assert all("input_ids" in chunk for chunk in store.meta)
+    assert max(len(chunk["input_ids"]) for chunk in store.meta) == StubSentenceTransformer.max_seq_length
+    np.testing.assert_allclose(store.embeddings, expected, rtol=1e-5, atol=1e-6)
+
+    _, metadata = build_index_from_chunks(store, STUB_DIMENSION)
+    assert metadata == chunks
+
+
+def test_tokenize_chunks_reuses_ids_until_text_changes(embedder):
+    chunk = {"text": "plan coverage"}
+    embedder.tokenize_chunks([chunk])
+    ids = chunk["input_ids"]
+
+    embedder.tokenize_chunks([chunk])
+    assert chunk["input_ids"] is ids
+
+    chunk["text"] = "plan coverage deductible"
+    embedder.tokenize_chunks([chunk])
+    assert chunk["input_ids"] == embedder.tokenizer([chunk["text"]])["input_ids"][0]
+
+
+def test_embed_chunks_after_text_edit(embedder):
+    pytest.importorskip("torch")
+    chunk = {"text": "plan coverage"}
+    embedder.embed_chunks([chunk], show_progress=False)
+
+    chunk["text"] = "deductible premium enrollment"
+    embedder.embed_chunks([chunk], show_progress=False)
+
+    expected = embedder.embed_texts([chunk["text"]], show_progress=False)[0]
+    np.testing.assert_allclose(chunk["embedding"], expected, rtol=1e-5, atol=1e-6)
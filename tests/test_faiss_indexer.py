@@ -0,0 +1,164 @@
+"""Tests for ingestion.faiss_indexer: save/load round trips and search."""
+
+import faiss
+import numpy as np
+import pytest
+
+from ingestion.embedder import ChunkStore
+from ingestion.faiss_indexer import (
+    ArrowMetadata,
+    _get_nprobe,
+    batch_search,
+    build_index_from_chunks,
+    create_faiss_index,
+    hydrate_results,
+    load_index,
+    save_index,
+    search_index,
+)
+
+DIMENSION = 32
+METADATA_NAMES = ["metadata.json", "metadata.parquet", "metadata.arrow"]
+
+
+def _make_chunks(num_chunks: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    embeddings = rng.standard_normal((num_chunks, DIMENSION)).astype(np.float32)
+    return [
+        {
+            "text": f"chunk {i} text",
+            "source": f"plan_{i % 3}.pdf",
+            "page_num": i // 4 + 1,
+            "chunk_index": i % 4,
+            "embedding": embeddings[i],
+        }
+        for i in range(num_chunks)
+    ]
+
+
+@pytest.fixture
+def flat_index():
+    chunks = _make_chunks(200)
+    queries = np.stack([chunk["embedding"] for chunk in chunks[:10]])
+    index, metadata = build_index_from_chunks(chunks, DIMENSION)
+    return index, metadata, queries
+
+
+def _make_store(tmp_path, num_chunks: int = 100):
+    """ChunkStore over a read-only memmap, like Embedder.embed_stream() returns."""
+    rng = np.random.default_rng(1)
+    matrix = rng.standard_normal((num_chunks, DIMENSION)).astype(np.float32)
+    path = str(tmp_path / "embeddings.bin")
+    matrix.tofile(path)
+    embeddings = np.memmap(path, dtype=np.float32, mode="r", shape=matrix.shape)
+    meta = [{"text": f"chunk {i}", "input_ids": [1, 2]} for i in range(num_chunks)]
+    return ChunkStore(embeddings, meta), matrix
+
+
+@pytest.mark.parametrize("metric", ["ip", "l2"])
+def test_build_from_read_only_memmap_store(tmp_path, metric):
+    store, matrix = _make_store(tmp_path)
+    index, metadata = build_index_from_chunks(store, DIMENSION, metric=metric)
+
+    assert index.ntotal == len(matrix)
+    assert metadata[0] == {"text": "chunk 0"}
+    assert np.array_equal(store.embeddings, matrix)
+    assert search_index(index, matrix[7], top_k=1)[0]["idx"] == 7
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf"])
+def test_build_leaves_store_matrix_unchanged(index_type):
+    rng = np.random.default_rng(2)
+    matrix = rng.standard_normal((500, DIMENSION)).astype(np.float32)
+    store = ChunkStore(matrix.copy(), [{"text": str(i)} for i in range(len(matrix))])
+
+    build_index_from_chunks(store, DIMENSION, index_type=index_type, nlist=None)
+
+    assert np.array_equal(store.embeddings, matrix)
+
+
+@pytest.mark.parametrize("metadata_name", METADATA_NAMES)
+@pytest.mark.parametrize("mmap", [False, True])
+def test_save_load_round_trip(flat_index, tmp_path, metadata_name, mmap):
+    index, metadata, queries = flat_index
+    save_index(index, metadata, str(tmp_path), metadata_name=metadata_name)
+
+    loaded, loaded_metadata = load_index(
+        str(tmp_path / "index.faiss"),
+        str(tmp_path / metadata_name),
+        mmap=mmap
+    )
+
+    assert loaded.ntotal == index.ntotal
+    assert len(loaded_metadata) == len(metadata)
+    assert list(loaded_metadata) == metadata
+    assert loaded_metadata[5] == metadata[5]
+    assert batch_search(loaded, queries, top_k=5) == batch_search(index, queries, top_k=5)
+
+
+@pytest.mark.parametrize("metadata_name", ["metadata.parquet", "metadata.arrow"])
+def test_columnar_metadata_missing_fields(tmp_path, metadata_name):
+    chunks = _make_chunks(3)
+    chunks[1]["state"] = "NC"
+    index, metadata = build_index_from_chunks(chunks, DIMENSION)
+    save_index(index, metadata, str(tmp_path), metadata_name=metadata_name)
+
+    _, loaded_metadata = load_index(str(tmp_path / "index.faiss"), str(tmp_path / metadata_name))
+
+    assert isinstance(loaded_metadata, ArrowMetadata)
+    assert [meta["state"] for meta in loaded_metadata] == [None, "NC", None]
+    assert loaded_metadata.value_counts("state") == {"unknown": 2, "NC": 1}
+
+
+def test_search_index_finds_own_vector(flat_index):
+    index, metadata, queries = flat_index
+    results = search_index(index, queries[3], top_k=3)
+
+    assert results[0]["idx"] == 3
+    assert results[0]["rank"] == 0
+    assert hydrate_results(results, metadata)[0]["text"] == "chunk 3 text"
+
+
+def test_search_index_rejects_metadata_argument(flat_index):
+    index, metadata, queries = flat_index
+    with pytest.raises(TypeError):
+        search_index(index, metadata, queries[0])
+
+
+def test_numpy_backend_matches_faiss(flat_index):
+    index, _, queries = flat_index
+    faiss_results = batch_search(index, queries, top_k=5)
+    numpy_results = batch_search(index, queries, top_k=5, backend="numpy")
+
+    assert [[r["idx"] for r in rs] for rs in numpy_results] == \
+        [[r["idx"] for r in rs] for rs in faiss_results]
+
+
+def test_batch_search_nprobe_does_not_change_index():
+    chunks = _make_chunks(2000)
+    queries = np.stack([chunk["embedding"] for chunk in chunks[:20]])
+    index, _ = build_index_from_chunks(chunks, DIMENSION, index_type="ivf", nlist=None)
+    default_nprobe = _get_nprobe(index)
+
+    all_lists = batch_search(index, queries, top_k=5, nprobe=index.nlist)
+
+    assert _get_nprobe(index) == default_nprobe
+    assert [rs[0]["idx"] for rs in all_lists] == list(range(20))
+
+
+@pytest.mark.parametrize("index_type,nbits,expected", [
+    ("ivfpq", None, 8),
+    ("ivfpq", 4, 4),
+    ("ivfpq", 6, 6),
+    ("opq_ivfpq", None, 8),
+    ("opq_ivfpq", 4, 4),
+    ("ivfpq_fs", None, 4),
+])
+def test_pq_nbits(index_type, nbits, expected):
+    index = create_faiss_index(DIMENSION, index_type, nlist=8, m=8, nbits=nbits)
+    assert faiss.downcast_index(faiss.extract_index_ivf(index)).pq.nbits == expected
+
+
+def test_fast_scan_rejects_other_nbits():
+    with pytest.raises(ValueError):
+        create_faiss_index(DIMENSION, "ivfpq_fs", nlist=8, m=8, nbits=8)
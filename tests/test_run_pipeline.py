@@ -0,0 +1,90 @@
+"""Tests for ingestion.run_pipeline: streamed per-file processing matches the materialized steps."""
+
+import pytest
+
+from ingestion.chunker import chunk_pages, iter_chunks
+from ingestion.pdf_parser import parse_pdf
+from ingestion.run_pipeline import _process_pdf_file, process_pdfs_iter
+from ingestion.text_cleaner import clean_pages, clean_pages_iter
+
+pymupdf = pytest.importorskip("pymupdf")
+
+SETTINGS = dict(parser="pymupdf", chunk_size=200, chunk_overlap=30, sentence_splitter="simple")
+
+
+def _write_pdf(path, pages):
+    doc = pymupdf.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (50, 50, -50, -50), text, fontsize=9)
+    doc.save(str(path))
+    doc.close()
+
+
+@pytest.fixture
+def pdf_paths(tmp_path, sample_pages):
+    """Three PDFs of different lengths; the last is long enough for the page pools."""
+    texts = [page["text"] for page in sample_pages]
+    sizes = {"b_short.pdf": 2, "a_medium.pdf": 9, "c_long.pdf": 40}
+    paths = []
+    start = 0
+    for name, num_pages in sizes.items():
+        _write_pdf(tmp_path / name, texts[start:start + num_pages])
+        paths.append(str(tmp_path / name))
+        start += num_pages
+    return paths
+
+
+def _materialized(path):
+    """The pipeline before streaming: every step returns a full list."""
+    pages = parse_pdf(path, parser=SETTINGS["parser"])
+    cleaned = clean_pages(pages)
+    chunks = chunk_pages(cleaned, SETTINGS["chunk_size"], SETTINGS["chunk_overlap"],
+                         splitter=SETTINGS["sentence_splitter"])
+    return len(pages), len(cleaned), chunks
+
+
+def test_process_pdf_file_matches_materialized(pdf_paths):
+    for path in pdf_paths:
+        num_pages, num_cleaned, chunks = _materialized(path)
+        info, got_pages, got_cleaned, got_chunks = _process_pdf_file(path, *SETTINGS.values())
+
+        assert info["filename"] in path
+        assert (got_pages, got_cleaned) == (num_pages, num_cleaned)
+        assert chunks
+        assert got_chunks == chunks
+
+
+def test_streaming_steps_match_materialized(pdf_paths):
+    for path in pdf_paths:
+        streamed = list(iter_chunks(
+            clean_pages_iter(parse_pdf(path)),
+            SETTINGS["chunk_size"],
+            SETTINGS["chunk_overlap"],
+            splitter=SETTINGS["sentence_splitter"]
+        ))
+        assert streamed == _materialized(path)[2]
+
+
+@pytest.mark.parametrize("workers", [1, 2, None])
+def test_process_pdfs_iter_keeps_file_order(pdf_paths, workers):
+    expected = [_materialized(path) for path in pdf_paths]
+
+    results = list(process_pdfs_iter(pdf_paths, workers=workers, **SETTINGS))
+
+    assert [info["filename"] for info, *_ in results] == ["b_short.pdf", "a_medium.pdf", "c_long.pdf"]
+    assert [tuple(result[1:]) for result in results] == expected
+
+
+def test_process_pdfs_iter_single_file_with_workers(pdf_paths, tmp_path):
+    # One file runs in this process, with the page pools of each step
+    path = pdf_paths[-1]
+    results = list(process_pdfs_iter([path], workers=2, cache_dir=str(tmp_path / "cache"), **SETTINGS))
+    assert [tuple(result[1:]) for result in results] == [_materialized(path)]
+
+
+def test_process_pdfs_iter_is_lazy(pdf_paths):
+    processed = process_pdfs_iter(pdf_paths, workers=1, **SETTINGS)
+    info, *_ = next(processed)
+    assert info["filename"] == "b_short.pdf"
+    processed.close()
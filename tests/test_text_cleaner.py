@@ -0,0 +1,44 @@
+"""Tests for ingestion.text_cleaner: parallel cleaning matches sequential cleaning."""
+
+from ingestion import text_cleaner
+from ingestion.text_cleaner import clean_pages, clean_pages_iter, clean_text
+
+
+def test_clean_pages_parallel_matches_serial(sample_pages):
+    assert len(sample_pages) > text_cleaner.PARALLEL_MIN_PAGES
+
+    serial = clean_pages(sample_pages, workers=1)
+    parallel = clean_pages(sample_pages, workers=2)
+
+    assert serial
+    assert parallel == serial
+
+
+def test_clean_pages_matches_clean_text(sample_pages):
+    expected = [
+        {**page, "text": clean_text(page["text"])}
+        for page in sample_pages
+        if clean_text(page["text"])
+    ]
+    assert clean_pages(sample_pages) == expected
+    assert list(clean_pages_iter(sample_pages)) == expected
+
+
+def test_clean_pages_drops_empty_pages(sample_pages):
+    cleaned = clean_pages(sample_pages)
+    assert len(cleaned) < len(sample_pages)
+    assert all(page["text"] for page in cleaned)
+
+
+def test_clean_pages_leaves_input_unchanged(sample_pages):
+    before = [dict(page) for page in sample_pages]
+    clean_pages(sample_pages, workers=2)
+    assert sample_pages == before
+
+
+def test_clean_pages_defaults_to_serial(sample_pages, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("clean_pages() started a process pool")
+
+    monkeypatch.setattr(text_cleaner, "ProcessPoolExecutor", no_pool)
+    assert clean_pages(sample_pages) == list(clean_pages_iter(sample_pages))